@@ -0,0 +1,319 @@
+import bisect
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+import tkinter as tk
+from collections import OrderedDict
+from PIL import Image, ImageTk
+import frame_cache
+from config_store import setting_number
+
+FRAME_SIZE = (60, 60)
+DEFAULT_BUDGET_KB = 2048
+DEFAULT_IDLE_SECONDS = 300
+DEFAULT_ATLAS = os.path.join('assets', 'animations.json')
+
+
+def decode_frames(path, size=FRAME_SIZE):
+    """Decode every frame of a GIF, scaled to fit `size`, with its duration in ms"""
+    gif = Image.open(path)
+    frames = []
+    durations = []
+    for frame in range(getattr(gif, 'n_frames', 1)):
+        gif.seek(frame)
+        frame_image = gif.convert('RGBA')
+        frame_image.thumbnail(size, Image.Resampling.LANCZOS)
+        frames.append(frame_image)
+        durations.append(gif.info.get('duration', 100) or 100)
+    return frames, durations
+
+
+def load_frames(path, size=FRAME_SIZE):
+    """Like decode_frames, but served from the on-disk frame cache when it is warm"""
+    try:
+        key = frame_cache.cache_key(path, size)
+    except OSError:
+        key = None
+    if key is not None:
+        cached = frame_cache.read_frames(key)
+        if cached is not None:
+            return cached
+
+    frames, durations = decode_frames(path, size)
+    if key is not None:
+        frame_cache.write_frames(key, frames, durations)
+    return frames, durations
+
+
+def load_atlas_index(path):
+    """Read a sprite-atlas index written by generate_animations.py --atlas"""
+    with open(path, 'r') as f:
+        index = json.load(f)
+    index['image'] = os.path.join(os.path.dirname(path), index['image'])
+    # Atlas frames stand in for a GIF only if they were generated from that exact file
+    index['by_source'] = {entry['source_sha1']: entry for entry in index['animations'].values()
+                          if 'source_sha1' in entry}
+    return index
+
+
+def slice_atlas(root, atlas, rects):
+    """Copy frame rectangles out of a decoded atlas PhotoImage; repeated rectangles share one image"""
+    photos = {}
+    frames = []
+    for x, y, width, height in rects:
+        key = (x, y, width, height)
+        if key not in photos:
+            photo = tk.PhotoImage(master=root, width=width, height=height)
+            photo.tk.call(photo, 'copy', atlas, '-from', x, y, x + width, y + height)
+            photos[key] = photo
+        frames.append(photos[key])
+    return frames
+
+
+class Animation:
+    def __init__(self, frames, durations):
+        self.frames = frames  # PhotoImages
+        self.durations = durations
+        unique = {id(photo): photo for photo in frames}.values()
+        self.nbytes = sum(photo.width() * photo.height() * 4 for photo in unique)
+        self.last_used = time.monotonic()
+
+
+class AnimationCache:
+    """Decodes notification animations the first time a type is shown.
+
+    Decoded frames live in an LRU cache bounded by `animation_cache_kb` and are
+    dropped after `animation_idle_seconds` without use. Callers that display
+    frames keep their own reference, so eviction never frees a visible image.
+
+    Animations found in the sprite atlas (`animation_atlas`, matched by the
+    content hash of the configured GIF) are sliced out of one PNG that is
+    decoded once; anything else is decoded from its own GIF.
+    """
+
+    def __init__(self, root, settings):
+        self.root = root
+        self.paths = {}
+        self._entries = OrderedDict()  # notification type -> Animation
+        self._missing = set()
+        self._bytes = 0
+        self._sweep_job = None
+        self._pending_settings = None
+        self.atlas_path = None
+        self._atlas_index = None  # None until read, False if there is no usable atlas
+        self._atlas_image = None
+        self.configure(settings)
+
+    def update_settings(self, settings):
+        """Thread-safe: the new settings are applied on the next get() on the Tk thread"""
+        self._pending_settings = settings
+
+    def configure(self, settings):
+        paths = settings.get('animation', {})
+        atlas_path = settings.get('animation_atlas', DEFAULT_ATLAS)
+        if atlas_path != self.atlas_path:
+            self.clear()
+            self.atlas_path = atlas_path
+            self._atlas_index = None
+        for notification_type in list(self._entries):
+            if self.paths.get(notification_type) != paths.get(notification_type):
+                self._evict(notification_type)
+        self.paths = dict(paths)
+        self._missing.clear()
+        self.budget = int(setting_number(settings, 'animation_cache_kb', DEFAULT_BUDGET_KB) * 1024)
+        self.idle_seconds = setting_number(settings, 'animation_idle_seconds', DEFAULT_IDLE_SECONDS)
+        self._enforce_budget()
+
+    def get(self, notification_type):
+        """Return the Animation for a notification type, or None if it has none"""
+        settings, self._pending_settings = self._pending_settings, None
+        if settings is not None:
+            self.configure(settings)
+
+        animation = self._entries.get(notification_type)
+        if animation is not None:
+            self._entries.move_to_end(notification_type)
+            animation.last_used = time.monotonic()
+            return animation
+
+        path = self.paths.get(notification_type)
+        if not path or notification_type in self._missing:
+            return None
+        animation = self._load_from_atlas(path)
+        if animation is None:
+            if not os.path.exists(path):
+                self._missing.add(notification_type)
+                return None
+            try:
+                frames, durations = load_frames(path)
+            except Exception as e:
+                print(f"Error loading animation {path}: {str(e)}")
+                self._missing.add(notification_type)
+                return None
+            animation = Animation([ImageTk.PhotoImage(frame, master=self.root) for frame in frames], durations)
+
+        self._entries[notification_type] = animation
+        self._bytes += animation.nbytes
+        self._enforce_budget(keep=notification_type)
+        self._schedule_sweep()
+        return animation
+
+    def _load_from_atlas(self, path):
+        if self._atlas_index is None:
+            self._atlas_index = False
+            if self.atlas_path and os.path.exists(self.atlas_path):
+                try:
+                    self._atlas_index = load_atlas_index(self.atlas_path)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Error loading animation atlas {self.atlas_path}: {str(e)}")
+        if not self._atlas_index or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                entry = self._atlas_index['by_source'].get(hashlib.sha1(f.read()).hexdigest())
+        except OSError:
+            return None
+        if entry is None:
+            return None
+        try:
+            if self._atlas_image is None:
+                # One decode serves every animation in the atlas
+                self._atlas_image = tk.PhotoImage(master=self.root, file=self._atlas_index['image'])
+            frames = slice_atlas(self.root, self._atlas_image, entry['frames'])
+        except tk.TclError as e:
+            print(f"Error loading animation atlas {self._atlas_index['image']}: {str(e)}")
+            self._atlas_index = False
+            return None
+        return Animation(frames, entry['durations'])
+
+    def _evict(self, notification_type):
+        animation = self._entries.pop(notification_type, None)
+        if animation is not None:
+            self._bytes -= animation.nbytes
+
+    def _enforce_budget(self, keep=None):
+        for notification_type in list(self._entries):
+            if self._bytes <= self.budget:
+                break
+            if notification_type != keep:
+                self._evict(notification_type)
+
+    def _schedule_sweep(self):
+        if self._sweep_job is None and self._entries:
+            self._sweep_job = self.root.after(int(self.idle_seconds * 1000), self._sweep)
+
+    def _sweep(self):
+        self._sweep_job = None
+        cutoff = time.monotonic() - self.idle_seconds
+        for notification_type, animation in list(self._entries.items()):
+            if animation.last_used < cutoff:
+                self._evict(notification_type)
+        if not self._entries:
+            self._atlas_image = None
+        self._schedule_sweep()
+
+    def clear(self):
+        if self._sweep_job is not None:
+            self.root.after_cancel(self._sweep_job)
+            self._sweep_job = None
+        self._entries.clear()
+        self._bytes = 0
+        self._atlas_image = None
+
+
+class _Playback:
+    def __init__(self, canvas, item, animation, now):
+        self.canvas = canvas
+        self.item = item
+        self.animation = animation
+        self.started = now
+        self.frame = 0
+        self.offsets = []  # start of each frame within one loop, in seconds
+        total = 0
+        for duration in animation.durations:
+            self.offsets.append(total)
+            total += duration / 1000.0
+        self.cycle = total
+        self.next_due = now + self.offsets[1] if len(self.offsets) > 1 else now + self.cycle
+
+    def advance(self, now):
+        """Show the frame that should be visible at `now`, skipping any that were missed"""
+        cycles, position = divmod(now - self.started, self.cycle)
+        frame = bisect.bisect_right(self.offsets, position) - 1
+        if frame != self.frame:
+            self.frame = frame
+            self.canvas.itemconfigure(self.item, image=self.animation.frames[frame])
+        loop_start = self.started + cycles * self.cycle
+        if frame + 1 < len(self.offsets):
+            self.next_due = loop_start + self.offsets[frame + 1]
+        else:
+            self.next_due = loop_start + self.cycle
+
+
+class AnimationPlayer:
+    """Plays every visible animation from a single shared after() timer.
+
+    The timer is armed for the earliest frame deadline across all playbacks
+    and is not rescheduled once nothing is playing.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._playbacks = {}
+        self._tokens = itertools.count()
+        self._job = None
+        self._job_due = None
+
+    def play(self, canvas, item, animation):
+        """Start animating a canvas image item; returns a token for stop()"""
+        canvas.itemconfigure(item, image=animation.frames[0])
+        if len(animation.frames) < 2:
+            return None
+        token = next(self._tokens)
+        self._playbacks[token] = _Playback(canvas, item, animation, time.monotonic())
+        self._arm()
+        return token
+
+    def stop(self, token):
+        self._playbacks.pop(token, None)
+        if not self._playbacks:
+            self._cancel()
+
+    def _cancel(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+            self._job_due = None
+
+    def _arm(self):
+        if not self._playbacks:
+            self._cancel()
+            return
+        due = min(playback.next_due for playback in self._playbacks.values())
+        if self._job is not None and self._job_due <= due:
+            return
+        self._cancel()
+        delay_ms = max(1, math.ceil((due - time.monotonic()) * 1000))
+        self._job = self.root.after(delay_ms, self._tick)
+        self._job_due = due
+
+    def _tick(self):
+        self._job = None
+        self._job_due = None
+        now = time.monotonic()
+        for token, playback in list(self._playbacks.items()):
+            if playback.next_due > now:
+                continue
+            try:
+                playback.advance(now)
+            except tk.TclError:
+                # The canvas went away without stop() being called
+                del self._playbacks[token]
+        self._arm()
+
+    def stop_all(self):
+        self._playbacks.clear()
+        self._cancel()
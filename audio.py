@@ -0,0 +1,122 @@
+import sys
+import threading
+import time
+import wave
+from metrics import registry
+
+DEFAULT_SOUND = 'Soukya app tone.wav'
+# Requests arriving while a sound plays, or this soon after it, are folded into it
+COALESCE_SECONDS = 0.5
+
+_played = registry.counter('sounds_played')
+_coalesced = registry.counter('sounds_coalesced')
+
+
+class Sound:
+    """A WAV file decoded once into memory"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = f.read()  # whole file, for winsound's SND_MEMORY
+        with wave.open(path, 'rb') as w:
+            self.channels = w.getnchannels()
+            self.sample_width = w.getsampwidth()
+            self.rate = w.getframerate()
+            self.pcm = w.readframes(w.getnframes())
+            self.duration = w.getnframes() / float(self.rate)
+
+
+def _load_backend():
+    """Return a blocking play(sound) function, or None when no audio output is available"""
+    if sys.platform == 'win32':
+        import winsound
+        return lambda sound: winsound.PlaySound(sound.data, winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+    try:
+        import simpleaudio
+    except ImportError:
+        return None
+    return lambda sound: simpleaudio.play_buffer(sound.pcm, sound.channels, sound.sample_width,
+                                                 sound.rate).wait_done()
+
+
+class SoundPlayer:
+    """Plays notification sounds from a dedicated worker thread.
+
+    Sounds are decoded once and kept in memory. play() only records the
+    request and returns, so neither the Tk thread nor the scheduler ever waits
+    on audio; a burst of notifications plays a single sound.
+
+    Settings: `sound_enabled` turns sound off entirely and `notification_sounds`
+    maps a notification type to a WAV path, or to false for silence. Types not
+    listed use the app tone.
+    """
+
+    def __init__(self, settings):
+        self.enabled = True
+        self.sounds = {}
+        self._cache = {}  # path -> Sound, or None if it failed to load
+        self._pending = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self.configure(settings)
+
+    def configure(self, settings):
+        with self._cond:
+            self.enabled = settings.get('sound_enabled', True)
+            self.sounds = dict(settings.get('notification_sounds', {}))
+
+    def _path_for(self, notification_type):
+        path = self.sounds.get(notification_type, DEFAULT_SOUND)
+        if path is True:
+            path = DEFAULT_SOUND
+        return path or None
+
+    def play(self, notification_type):
+        """Queue the sound for a notification type; returns immediately"""
+        with self._cond:
+            if not self.enabled:
+                return
+            path = self._path_for(notification_type)
+            if path is None:
+                return
+            if self._pending is not None:
+                _coalesced.inc()
+                return
+            self._pending = path
+            self._cond.notify()
+
+    def _sound(self, path):
+        if path not in self._cache:
+            try:
+                self._cache[path] = Sound(path)
+            except (OSError, EOFError, wave.Error) as e:
+                print(f"Error loading sound {path}: {str(e)}")
+                self._cache[path] = None
+        return self._cache[path]
+
+    def _run(self):
+        backend = _load_backend()
+        if backend is None:
+            print("No audio backend available, notification sounds are disabled")
+        # Decode the default tone up front so the first notification isn't delayed
+        self._sound(DEFAULT_SOUND)
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                path = self._pending
+            sound = self._sound(path)
+            if sound is not None and backend is not None:
+                try:
+                    backend(sound)
+                    _played.inc()
+                except Exception as e:
+                    print(f"Error playing sound: {str(e)}")
+            time.sleep(COALESCE_SECONDS)
+            with self._cond:
+                self._pending = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
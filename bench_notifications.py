@@ -0,0 +1,218 @@
+"""Headless latency and throughput benchmarks for the notification path.
+
+Runs NotificationQueue against HeadlessRenderer, with a worker thread standing
+in for the Tk mainloop, and reports enqueue-to-display latency, render time,
+throughput and memory per toast for a few scenarios. Results are written as
+JSON; pass --baseline with an earlier result file to fail on regressions.
+
+    python bench_notifications.py --output bench.json
+    python bench_notifications.py --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from notifications import NotificationQueue
+from renderers import HeadlessRenderer
+
+LONG_MESSAGE = "\n".join(
+    f"Line {i}: take a short walk, roll your shoulders and drink a glass of water before the next meeting."
+    for i in range(20)
+)
+ANIMATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'blink_eyes.gif')
+
+
+class UiThread:
+    """Stands in for the Tk mainloop: runs queue.process() whenever it is woken"""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.shown_items = 0
+        self._wake = threading.Event()
+        self._cond = threading.Condition()
+        self._running = True
+        queue.wake = self._wake.set
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._running:
+                return
+            notification = self.queue.process()
+            if notification is not None:
+                with self._cond:
+                    self.shown_items += len(notification.items)
+                    self._cond.notify_all()
+
+    def wait_for(self, items, timeout=30):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.shown_items >= items, timeout):
+                raise RuntimeError(f"Only {self.shown_items} of {items} notifications were shown")
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+
+
+class AnimationLoader:
+    """Decodes the real GIF when Pillow and the asset are available, else fakes 15 frames.
+
+    Frames are decoded directly rather than through the on-disk frame cache,
+    so a benchmark run leaves nothing behind. `real_frames` records which
+    happened, since placeholder timings aren't comparable with real ones.
+    """
+
+    def __init__(self, path=ANIMATION_PATH):
+        self.path = path
+        self.real_frames = False
+
+    def __call__(self, notification_type):
+        try:
+            from animations import decode_frames
+            frames, _ = decode_frames(self.path)
+        except (ImportError, OSError) as e:
+            print(f"Benchmarking with placeholder animation frames: {str(e)}", file=sys.stderr)
+            return [None] * 15
+        self.real_frames = True
+        return frames
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize_ms(values):
+    return {
+        'p50': round(percentile(values, 50) * 1000, 4),
+        'p95': round(percentile(values, 95) * 1000, 4),
+        'p99': round(percentile(values, 99) * 1000, 4),
+        'max': round(max(values) * 1000, 4) if values else 0.0
+    }
+
+
+def run_scenario(batch, rounds, animation_loader=None):
+    """Submit `batch` `rounds` times, waiting for each round to be displayed"""
+    renderer = HeadlessRenderer(animation_loader=animation_loader)
+    queue = NotificationQueue(renderer)
+    ui = UiThread(queue)
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    submitted = 0
+    for _ in range(rounds):
+        for title, message, notification_type in batch:
+            queue.submit(title, message, notification_type)
+        submitted += len(batch)
+        ui.wait_for(submitted)
+    elapsed = time.perf_counter() - start
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    ui.stop()
+
+    latencies = [record.shown_at - item.created
+                 for record in renderer.rendered for item in record.notification.items]
+    render_times = [record.render_seconds for record in renderer.rendered]
+    toasts = len(renderer.rendered)
+    return {
+        'notifications': submitted,
+        'toasts': toasts,
+        'latency_ms': summarize_ms(latencies),
+        'render_ms': summarize_ms(render_times),
+        'throughput_per_s': round(submitted / elapsed, 1) if elapsed else 0.0,
+        'memory_per_toast_bytes': int((memory_after - memory_before) / toasts) if toasts else 0
+    }
+
+
+def run_animation_scenario(rounds):
+    loader = AnimationLoader()
+    result = run_scenario([("Look Away", "Relax your eyes for a moment.", "eye")], rounds, animation_loader=loader)
+    result['real_frames'] = loader.real_frames
+    return result
+
+
+SCENARIOS = {
+    'single': lambda rounds: run_scenario([("Look Away", "Relax your eyes for a moment.", "eye")], rounds),
+    'burst_100': lambda rounds: run_scenario(
+        [(f"Reminder {i}", "Time for your scheduled reminder!", "greeting") for i in range(100)],
+        max(1, rounds // 10)),
+    'animation': run_animation_scenario,
+    'long_message': lambda rounds: run_scenario([("Daily plan", LONG_MESSAGE, "greeting")], rounds),
+}
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Return a list of regression descriptions against a baseline result file"""
+    regressions = []
+    for name, result in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        if previous.get('real_frames') != result.get('real_frames'):
+            regressions.append(f"{name} used {'real' if result.get('real_frames') else 'placeholder'} frames, "
+                               f"the baseline didn't; results are not comparable")
+            continue
+        for metric in ('latency_ms', 'render_ms'):
+            old, new = previous[metric]['p95'], result[metric]['p95']
+            if old > 0 and new > old * (1 + tolerance) and new - old > min_delta_ms:
+                regressions.append(f"{name} {metric} p95 {old:.3f} -> {new:.3f}")
+        old, new = previous['throughput_per_s'], result['throughput_per_s']
+        if old > 0 and new < old * (1 - tolerance):
+            regressions.append(f"{name} throughput {old:.1f}/s -> {new:.1f}/s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the notification path without a display")
+    parser.add_argument('--rounds', type=int, default=200, help="rounds per scenario (bursts run rounds/10)")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help="run only these scenarios")
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative regression (default 0.25)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help="ignore timing changes smaller than this, which are noise (default 0.05)")
+    args = parser.parse_args(argv)
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'scenarios': {}
+    }
+    for name in args.scenario or SCENARIOS:
+        result = SCENARIOS[name](args.rounds)
+        results['scenarios'][name] = result
+        print(f"{name:<14} latency p50/p95/p99 {result['latency_ms']['p50']:.3f}/{result['latency_ms']['p95']:.3f}/"
+              f"{result['latency_ms']['p99']:.3f} ms  render p95 {result['render_ms']['p95']:.3f} ms  "
+              f"{result['throughput_per_s']:.0f}/s  {result['memory_per_toast_bytes']} B/toast", file=sys.stderr)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
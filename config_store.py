@@ -0,0 +1,158 @@
+import copy
+import json
+import os
+import threading
+import time
+from config_watcher import ConfigWatcher
+from metrics import registry
+
+WRITE_DELAY = 0.5  # seconds of quiet before pending changes are written
+MAX_WRITE_DELAY = 2.0  # upper bound while changes keep arriving
+
+_writes = registry.counter('config_writes')
+_bytes_written = registry.counter('config_bytes_written')
+
+
+def setting_number(settings, key, default):
+    """Read a numeric setting, tolerating strings from a hand-edited config.json"""
+    try:
+        return float(settings.get(key, default))
+    except (TypeError, ValueError):
+        print(f"Invalid {key} {settings.get(key)!r}, using {default}")
+        return default
+
+
+class ConfigStore:
+    """Single owner of config.json.
+
+    Settings live in memory and every change is applied there immediately;
+    one background thread coalesces rapid changes and writes the file
+    atomically (temp file, fsync, rename), so the Tk thread never blocks on
+    disk and readers never see a half-written file. Edits made to the file
+    by hand are picked up through ConfigWatcher.
+    """
+
+    def __init__(self, path='config.json'):
+        self.path = os.path.abspath(path)
+        self.settings = {}
+        self._subscribers = []
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # keeps snapshots hitting the disk in order
+        self._dirty = False
+        self._first_change = None
+        self._last_change = None
+        self._writer = None
+        self.watcher = ConfigWatcher(self.path)
+        self.watcher.subscribe(self._on_disk_change)
+
+    def load(self, default=None):
+        """Read the config file, seeding it with `default` if it doesn't exist"""
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                settings = json.load(f)
+            with self._cond:
+                self.settings = settings
+        elif default is not None:
+            self.update(default)
+        return self.get()
+
+    def get(self):
+        """Return a private copy of the current settings"""
+        with self._cond:
+            return copy.deepcopy(self.settings)
+
+    def subscribe(self, callback):
+        """Call `callback(settings)` whenever the settings change, in memory or on disk"""
+        self._subscribers.append(callback)
+
+    def update(self, changes):
+        """Apply `changes` immediately and schedule a write of the whole file"""
+        with self._cond:
+            self.settings.update(copy.deepcopy(changes))
+            now = time.monotonic()
+            if not self._dirty:
+                self._dirty = True
+                self._first_change = now
+            self._last_change = now
+            self._cond.notify()
+        self._notify()
+
+    def _notify(self):
+        settings = self.get()
+        for callback in list(self._subscribers):
+            try:
+                callback(settings)
+            except Exception as e:
+                print(f"Error in settings subscriber: {str(e)}")
+
+    def _on_disk_change(self, settings):
+        with self._cond:
+            # Ignore our own writes, and let pending in-memory edits win over the file
+            if self._dirty or settings == self.settings:
+                return
+            self.settings = settings
+        print("Settings reloaded successfully")
+        self._notify()
+
+    def _write(self, data):
+        encoded = data.encode('utf-8')
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _writes.inc()
+        _bytes_written.inc(len(encoded))
+
+    def _take_snapshot(self):
+        self._dirty = False
+        return json.dumps(self.settings, indent=4)
+
+    def _wait_until_due(self):
+        with self._cond:
+            while True:
+                if self._dirty:
+                    now = time.monotonic()
+                    due = min(self._last_change + WRITE_DELAY, self._first_change + MAX_WRITE_DELAY)
+                    if now >= due:
+                        return
+                    self._cond.wait(due - now)
+                else:
+                    self._cond.wait()
+
+    def _run_writer(self):
+        while True:
+            self._wait_until_due()
+            self.flush()
+
+    def flush(self):
+        """Write pending changes now; also used right before exiting"""
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                data = self._take_snapshot()
+            try:
+                self._write(data)
+            except OSError as e:
+                print(f"Error saving settings: {str(e)}")
+
+    def start(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run_writer, daemon=True)
+            self._writer.start()
+            self.watcher.start()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store(path='config.json'):
+    """Return the process-wide ConfigStore"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConfigStore(path)
+        return _store
@@ -0,0 +1,138 @@
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from metrics import registry
+
+# inotify event masks, see <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+_reloads = registry.counter('config_reloads')
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        # Imported here, on the watcher thread: ctypes pulls in subprocess and is slow to load at startup
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (ImportError, OSError, AttributeError):
+        return None
+
+
+class ConfigWatcher:
+    """Watches config.json and notifies subscribers when its contents change.
+
+    Uses inotify on Linux and falls back to polling the file's stat signature
+    elsewhere, so the JSON is only parsed when the file actually changed.
+    """
+
+    def __init__(self, path='config.json', poll_interval=1.0):
+        self.path = os.path.abspath(path)
+        self.poll_interval = poll_interval
+        self.settings = None
+        self._subscribers = []
+        self._signature = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+    def subscribe(self, callback):
+        """Call `callback(settings)` every time the config file changes"""
+        self._subscribers.append(callback)
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def check(self):
+        """Re-parse the config if it changed on disk; returns True if it did"""
+        with self._lock:
+            signature = self._stat_signature()
+            if signature is None or signature == self._signature:
+                return False
+            try:
+                with open(self.path, 'r') as f:
+                    settings = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reloading settings: {str(e)}")
+                return False
+            self._signature = signature
+            if settings == self.settings:
+                return False
+            self.settings = settings
+        _reloads.inc()
+
+        for callback in list(self._subscribers):
+            try:
+                callback(settings)
+            except Exception as e:
+                print(f"Error in settings subscriber: {str(e)}")
+        return True
+
+    def _watch_inotify(self, libc):
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            return False
+        directory, filename = os.path.split(self.path)
+        # Only react once a writer closed the file or renamed it into place,
+        # so a half-written file is never parsed
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return False
+
+        print("Watching config.json with inotify")
+        name = os.fsencode(filename)
+        try:
+            while self._running:
+                buf = os.read(fd, 4096)
+                changed = False
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(buf):
+                    _, _, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                    offset += _EVENT_HEADER.size
+                    if buf[offset:offset + length].rstrip(b"\0") == name:
+                        changed = True
+                    offset += length
+                if changed:
+                    self.check()
+        finally:
+            os.close(fd)
+        return True
+
+    def _watch_polling(self):
+        print("Watching config.json by polling")
+        while self._running:
+            self.check()
+            time.sleep(self.poll_interval)
+
+    def _run(self):
+        libc = _load_inotify()
+        if libc is not None and self._watch_inotify(libc):
+            return
+        self._watch_polling()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._signature = self._stat_signature()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
@@ -0,0 +1,106 @@
+import json
+import time
+import tkinter as tk
+from tkinter import ttk
+from metrics import registry
+
+
+class DiagnosticsWindow:
+    """Shows a snapshot of the runtime metrics, opened from the tray menu"""
+
+    def __init__(self, parent):
+        self.window = tk.Toplevel(parent)
+        self.window.title("Soukya Diagnostics")
+        self.window.geometry("480x520")
+        self.window.attributes('-topmost', True)
+
+        container = ttk.Frame(self.window, padding="10")
+        container.pack(fill=tk.BOTH, expand=True)
+
+        self.text = tk.Text(container, font=('Consolas', 10), wrap='none')
+        self.text.pack(fill=tk.BOTH, expand=True)
+
+        button_frame = ttk.Frame(container)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Close", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Refresh", command=self.refresh).pack(side=tk.RIGHT, padx=5)
+
+        self.refresh()
+
+    def refresh(self):
+        self.text.configure(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert(tk.END, json.dumps(registry.snapshot(), indent=2))
+        self.text.configure(state='disabled')
+
+
+def tk_resource_counts(root):
+    """Count live widgets, Tcl commands, images and pending after() callbacks"""
+    widgets = 0
+    pending = [root]
+    while pending:
+        widget = pending.pop()
+        widgets += 1
+        pending.extend(widget.winfo_children())
+    return {
+        'widgets': widgets,
+        'tcl_commands': len(root.tk.splitlist(root.tk.call('info', 'commands'))),
+        'images': len(root.tk.splitlist(root.tk.call('image', 'names'))),
+        'after_callbacks': len(root.tk.splitlist(root.tk.call('after', 'info')))
+    }
+
+
+class LeakTracker:
+    """Samples Tk resource counts periodically and reports growth over time.
+
+    The counts are also published as gauges, so they show up in the
+    Diagnostics window and the metrics file.
+    """
+
+    def __init__(self, root, interval=300):
+        self.root = root
+        self.interval = interval
+        self.baseline = None
+        self.previous = None
+        self.samples = []  # (time, counts)
+        self._job = None
+        self._gauges = {name: registry.gauge(f'tk_{name}') for name in
+                        ('widgets', 'tcl_commands', 'images', 'after_callbacks')}
+
+    def sample(self):
+        counts = tk_resource_counts(self.root)
+        if self._job is not None:
+            # Don't count the tracker's own pending callback
+            counts['after_callbacks'] -= 1
+        for name, value in counts.items():
+            self._gauges[name].set(value)
+        self.samples.append((time.time(), counts))
+        if self.baseline is None:
+            self.baseline = counts
+        return counts
+
+    def growth(self, counts=None):
+        """Return how much each count grew since the first sample"""
+        counts = counts or self.sample()
+        return {name: counts[name] - self.baseline[name] for name in counts}
+
+    def _tick(self):
+        self._job = None
+        counts = self.sample()
+        growth = self.growth(counts)
+        if self.previous is not None and any(counts[name] > self.previous[name] for name in counts):
+            summary = ", ".join(f"{name} {count} ({growth[name]:+d})" for name, count in counts.items())
+            print(f"Tk resources grew: {summary}")
+        self.previous = counts
+        self._job = self.root.after(int(self.interval * 1000), self._tick)
+
+    def start(self):
+        if self._job is None:
+            self.sample()
+            self.previous = self.baseline
+            self._job = self.root.after(int(self.interval * 1000), self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
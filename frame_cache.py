@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import struct
+from PIL import Image
+from paths import cache_dir
+
+# File layout: magic, header length, JSON header, then every frame's raw RGBA pixels back to back
+MAGIC = b'SKYF1'
+_LENGTH = struct.Struct('<I')
+
+
+def cache_key(path, size):
+    """Key a scaled frame set by the source file's content hash and the target size"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}_{size[0]}x{size[1]}"
+
+
+def _cache_path(key):
+    return os.path.join(cache_dir('frames'), key + '.frames')
+
+
+def read_frames(key):
+    """Return (frames, durations) from the cache, or None on a miss"""
+    try:
+        with open(_cache_path(key), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(MAGIC):
+        return None
+
+    try:
+        offset = len(MAGIC)
+        (header_length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+
+        view = memoryview(data)
+        frames = []
+        for width, height in header['sizes']:
+            length = width * height * 4
+            frames.append(Image.frombuffer('RGBA', (width, height), view[offset:offset + length], 'raw', 'RGBA', 0, 1))
+            offset += length
+        return frames, header['durations']
+    except (ValueError, KeyError, struct.error) as e:
+        print(f"Ignoring corrupt frame cache {key}: {str(e)}")
+        return None
+
+
+def write_frames(key, frames, durations):
+    frames = [frame.convert('RGBA') for frame in frames]
+    header = json.dumps({'sizes': [frame.size for frame in frames], 'durations': durations}).encode()
+    try:
+        # Inside the try too: an unusable cache folder only means this set isn't cached
+        path = _cache_path(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC + _LENGTH.pack(len(header)) + header)
+            for frame in frames:
+                f.write(frame.tobytes())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write frame cache {key}: {str(e)}")
@@ -1,197 +1,372 @@
-from PIL import Image, ImageDraw
+from PIL import Image, ImageChops, ImageDraw
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import hashlib
+import json
 import os
+import time
 
-def create_blinking_eyes():
-    # Create a list to store frames
-    frames = []
-    size = (300, 200)  # Wider size for better eye spacing
-    
-    # Create 15 frames for smoother animation
-    for i in range(15):
-        # Create a new image with transparent background
-        img = Image.new('RGBA', size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Calculate eye openness based on frame
-        if i < 5:  # Open eyes
-            openness = 1.0
-        elif i < 10:  # Closing
-            openness = 1.0 - (i - 5) * 0.2
-        elif i < 12:  # Closed
-            openness = 0.0
-        else:  # Opening
-            openness = (i - 12) * 0.33
-        
-        # Draw face outline
-        face_color = (255, 223, 196)  # Skin tone
-        face_outline = (0, 0, 0)  # Black outline
-        draw.ellipse([50, 30, 250, 170], fill=face_color, outline=face_outline, width=3)
-        
-        # Draw eyebrows (they move slightly when blinking)
-        eyebrow_y = 60 - (5 if openness < 0.5 else 0)
-        draw.arc([80, eyebrow_y, 140, eyebrow_y + 20], 0, 180, fill='black', width=3)  # Left eyebrow
-        draw.arc([160, eyebrow_y, 220, eyebrow_y + 20], 0, 180, fill='black', width=3)  # Right eyebrow
-        
-        # Draw left eye
-        left_eye_x = 90
-        left_eye_y = 80
-        eye_width = 50
-        eye_height = int(50 * openness)
-        
-        # Draw eye outline
-        draw.ellipse([left_eye_x-2, left_eye_y-2, left_eye_x + eye_width+2, left_eye_y + eye_height+2], 
-                    fill='white', outline=face_outline, width=2)
-        
-        # Draw iris (only if eye is open enough)
-        if openness > 0.3:
-            iris_color = (0, 128, 255)  # Blue iris
-            iris_size = int(eye_height * 0.6)
-            iris_x = left_eye_x + (eye_width - iris_size) // 2
-            iris_y = left_eye_y + (eye_height - iris_size) // 2
-            draw.ellipse([iris_x, iris_y, iris_x + iris_size, iris_y + iris_size], 
-                        fill=iris_color, outline=face_outline, width=1)
-            
-            # Draw pupil
-            pupil_size = int(iris_size * 0.4)
-            pupil_x = iris_x + (iris_size - pupil_size) // 2
-            pupil_y = iris_y + (iris_size - pupil_size) // 2
-            draw.ellipse([pupil_x, pupil_y, pupil_x + pupil_size, pupil_y + pupil_size], 
-                        fill='black')
-            
-            # Draw highlight
-            highlight_size = int(pupil_size * 0.3)
-            highlight_x = pupil_x + pupil_size * 0.3
-            highlight_y = pupil_y + pupil_size * 0.3
-            draw.ellipse([highlight_x, highlight_y, highlight_x + highlight_size, highlight_y + highlight_size], 
-                        fill='white')
-        
-        # Draw right eye (mirror of left eye)
-        right_eye_x = 160
-        right_eye_y = 80
-        
-        # Draw eye outline
-        draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x + eye_width+2, right_eye_y + eye_height+2], 
-                    fill='white', outline=face_outline, width=2)
-        
-        # Draw iris (only if eye is open enough)
+FRAME_DURATION = 100  # ms per frame
+MAX_COLORS = 255  # one palette slot is kept for transparent pixels
+ALPHA_THRESHOLD = 128
+ATLAS_FRAME_SIZE = (60, 60)  # frames are stored in the atlas at the size toasts show them
+
+EYES_SIZE = (300, 200)  # Wider size for better eye spacing
+EYES_FRAMES = 15  # 15 frames for smoother animation
+BOTTLE_SIZE = (200, 300)  # Increased size for better visibility
+BOTTLE_FRAMES = 12
+
+
+def _box(box, scale):
+    return [v * scale for v in box]
+
+
+def _width(width, scale):
+    return max(1, int(round(width * scale)))
+
+
+def eyes_geometry(frame_count=EYES_FRAMES):
+    """Per-frame eye geometry for the whole animation, computed in one pass as a table"""
+    frames = range(frame_count)
+    # Open, closing, closed, opening
+    openness = [1.0 if i < 5 else 1.0 - (i - 5) * 0.2 if i < 10 else 0.0 if i < 12 else (i - 12) * 0.33
+                for i in frames]
+    eye_height = [int(50 * o) for o in openness]
+    iris_size = [int(h * 0.6) for h in eye_height]
+    pupil_size = [int(s * 0.4) for s in iris_size]
+    return [{
+        'openness': openness[i],
+        'eyebrow_y': 60 - (5 if openness[i] < 0.5 else 0),  # eyebrows move slightly when blinking
+        'eye_height': eye_height[i],
+        'iris_size': iris_size[i],
+        'iris_dy': (eye_height[i] - iris_size[i]) // 2,
+        'pupil_size': pupil_size[i],
+        'highlight_size': int(pupil_size[i] * 0.3)
+    } for i in frames]
+
+
+def draw_eyes(geometry, scale=1):
+    size = (int(EYES_SIZE[0] * scale), int(EYES_SIZE[1] * scale))
+    img = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    openness = geometry['openness']
+
+    # Draw face outline
+    face_color = (255, 223, 196)  # Skin tone
+    face_outline = (0, 0, 0)  # Black outline
+    draw.ellipse(_box([50, 30, 250, 170], scale), fill=face_color, outline=face_outline, width=_width(3, scale))
+
+    # Draw eyebrows
+    eyebrow_y = geometry['eyebrow_y']
+    draw.arc(_box([80, eyebrow_y, 140, eyebrow_y + 20], scale), 0, 180, fill='black', width=_width(3, scale))
+    draw.arc(_box([160, eyebrow_y, 220, eyebrow_y + 20], scale), 0, 180, fill='black', width=_width(3, scale))
+
+    eye_y = 80
+    eye_width = 50
+    eye_height = geometry['eye_height']
+    iris_size = geometry['iris_size']
+    pupil_size = geometry['pupil_size']
+    highlight_size = geometry['highlight_size']
+    iris_color = (0, 128, 255)  # Blue iris
+
+    # Right eye mirrors the left one
+    for eye_x in (90, 160):
+        draw.ellipse(_box([eye_x - 2, eye_y - 2, eye_x + eye_width + 2, eye_y + eye_height + 2], scale),
+                     fill='white', outline=face_outline, width=_width(2, scale))
+
+        # Draw iris, pupil and highlight only if the eye is open enough
         if openness > 0.3:
-            iris_x = right_eye_x + (eye_width - iris_size) // 2
-            iris_y = right_eye_y + (eye_height - iris_size) // 2
-            draw.ellipse([iris_x, iris_y, iris_x + iris_size, iris_y + iris_size], 
-                        fill=iris_color, outline=face_outline, width=1)
-            
-            # Draw pupil
+            iris_x = eye_x + (eye_width - iris_size) // 2
+            iris_y = eye_y + geometry['iris_dy']
+            draw.ellipse(_box([iris_x, iris_y, iris_x + iris_size, iris_y + iris_size], scale),
+                         fill=iris_color, outline=face_outline, width=_width(1, scale))
+
             pupil_x = iris_x + (iris_size - pupil_size) // 2
             pupil_y = iris_y + (iris_size - pupil_size) // 2
-            draw.ellipse([pupil_x, pupil_y, pupil_x + pupil_size, pupil_y + pupil_size], 
-                        fill='black')
-            
-            # Draw highlight
+            draw.ellipse(_box([pupil_x, pupil_y, pupil_x + pupil_size, pupil_y + pupil_size], scale), fill='black')
+
             highlight_x = pupil_x + pupil_size * 0.3
             highlight_y = pupil_y + pupil_size * 0.3
-            draw.ellipse([highlight_x, highlight_y, highlight_x + highlight_size, highlight_y + highlight_size], 
-                        fill='white')
-        
+            draw.ellipse(_box([highlight_x, highlight_y, highlight_x + highlight_size,
+                               highlight_y + highlight_size], scale), fill='white')
+
         # Draw eyelashes (only when eyes are open)
         if openness > 0.8:
-            # Left eye lashes
-            for j in range(5):
-                lash_x = left_eye_x + j * 10
-                draw.line([lash_x, left_eye_y, lash_x, left_eye_y - 8], fill='black', width=2)
-            # Right eye lashes
             for j in range(5):
-                lash_x = right_eye_x + j * 10
-                draw.line([lash_x, right_eye_y, lash_x, right_eye_y - 8], fill='black', width=2)
-        
-        frames.append(img)
-    
-    # Save as GIF
-    frames[0].save('assets/blink_eyes.gif',
-                  save_all=True,
-                  append_images=frames[1:],
-                  duration=100,  # 100ms per frame
-                  loop=0)  # Loop forever
-
-def create_water_bottle():
-    # Create a list to store frames
-    frames = []
-    size = (200, 300)  # Increased size for better visibility
-    
-    # Create 12 frames for smoother animation
-    for i in range(12):
-        # Create a new image with transparent background
-        img = Image.new('RGBA', size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Calculate bottle tilt based on frame
-        tilt = 15 * (i - 6)  # Tilt from -90 to 90 degrees
-        
-        # Draw bottle body
-        bottle_width = 80
-        bottle_height = 200
-        bottle_x = (size[0] - bottle_width) // 2
-        bottle_y = 40
-        
-        # Draw bottle cap
-        cap_width = 40
-        cap_height = 30
-        cap_x = (size[0] - cap_width) // 2
-        cap_y = 10
-        draw.rectangle([cap_x, cap_y, cap_x + cap_width, cap_y + cap_height], 
-                      fill='#FFD700', outline='black', width=2)  # Gold cap
-        
-        # Draw bottle neck
-        neck_width = 30
-        neck_height = 20
-        neck_x = (size[0] - neck_width) // 2
-        neck_y = cap_y + cap_height
-        draw.rectangle([neck_x, neck_y, neck_x + neck_width, neck_y + neck_height], 
-                      fill='#E6E6FA', outline='black', width=2)  # Light purple
-        
-        # Draw bottle body
-        bottle_color = '#E6E6FA'  # Light purple
-        draw.rectangle([bottle_x, bottle_y, bottle_x + bottle_width, bottle_y + bottle_height], 
-                      fill=bottle_color, outline='black', width=2)
-        
-        # Draw water level (moving up and down)
-        water_height = 120 + int(40 * (i / 6))  # Water level varies
-        water_y = bottle_y + bottle_height - water_height
-        water_color = '#87CEEB'  # Sky blue
-        draw.rectangle([bottle_x, water_y, bottle_x + bottle_width, bottle_y + bottle_height], 
-                      fill=water_color, outline='black', width=1)
-        
-        # Draw water surface (wavy effect)
-        wave_height = 5
-        for x in range(bottle_x, bottle_x + bottle_width, 5):
-            wave_y = water_y + wave_height * (i % 3)
-            draw.line([x, wave_y, x + 5, wave_y + wave_height], fill='white', width=2)
-        
-        # Draw bubbles
-        bubble_size = 8
-        for j in range(3):
-            bubble_x = bottle_x + 20 + j * 20
-            bubble_y = water_y + 20 + (i * 10) % 40
-            draw.ellipse([bubble_x, bubble_y, bubble_x + bubble_size, bubble_y + bubble_size], 
-                        fill='white', outline='black', width=1)
-        
-        frames.append(img)
-    
-    # Save as GIF
-    frames[0].save('assets/water_bottle.gif',
-                  save_all=True,
-                  append_images=frames[1:],
-                  duration=100,  # 100ms per frame
-                  loop=0)  # Loop forever
+                lash_x = eye_x + j * 10
+                draw.line(_box([lash_x, eye_y, lash_x, eye_y - 8], scale), fill='black', width=_width(2, scale))
+
+    return img
+
+
+def bottle_geometry(frame_count=BOTTLE_FRAMES):
+    """Per-frame water level, wave and bubble offsets, computed in one pass as a table"""
+    bottle_y, bottle_height = 40, 200
+    frames = range(frame_count)
+    water_height = [120 + int(40 * (i / 6)) for i in frames]  # Water level varies
+    water_y = [bottle_y + bottle_height - h for h in water_height]
+    return [{
+        'water_y': water_y[i],
+        'wave_y': water_y[i] + 5 * (i % 3),
+        'bubble_y': water_y[i] + 20 + (i * 10) % 40
+    } for i in frames]
+
+
+def draw_bottle(geometry, scale=1):
+    size = (int(BOTTLE_SIZE[0] * scale), int(BOTTLE_SIZE[1] * scale))
+    img = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    bottle_width = 80
+    bottle_height = 200
+    bottle_x = (BOTTLE_SIZE[0] - bottle_width) // 2
+    bottle_y = 40
+
+    # Draw bottle cap
+    cap_width = 40
+    cap_height = 30
+    cap_x = (BOTTLE_SIZE[0] - cap_width) // 2
+    cap_y = 10
+    draw.rectangle(_box([cap_x, cap_y, cap_x + cap_width, cap_y + cap_height], scale),
+                   fill='#FFD700', outline='black', width=_width(2, scale))  # Gold cap
+
+    # Draw bottle neck
+    neck_width = 30
+    neck_height = 20
+    neck_x = (BOTTLE_SIZE[0] - neck_width) // 2
+    neck_y = cap_y + cap_height
+    draw.rectangle(_box([neck_x, neck_y, neck_x + neck_width, neck_y + neck_height], scale),
+                   fill='#E6E6FA', outline='black', width=_width(2, scale))  # Light purple
+
+    # Draw bottle body
+    draw.rectangle(_box([bottle_x, bottle_y, bottle_x + bottle_width, bottle_y + bottle_height], scale),
+                   fill='#E6E6FA', outline='black', width=_width(2, scale))
+
+    # Draw water level (moving up and down)
+    water_y = geometry['water_y']
+    draw.rectangle(_box([bottle_x, water_y, bottle_x + bottle_width, bottle_y + bottle_height], scale),
+                   fill='#87CEEB', outline='black', width=_width(1, scale))  # Sky blue
+
+    # Draw water surface (wavy effect)
+    wave_height = 5  # rise across one segment
+    wave_width = 5
+    slope = wave_height / wave_width
+    wave_y = geometry['wave_y']
+    for x in range(bottle_x, bottle_x + bottle_width, wave_width):
+        # Keep the end segments inside the outline so the line width doesn't poke through it
+        start = max(x, bottle_x + 1)
+        end = min(x + wave_width, bottle_x + bottle_width - 1)
+        draw.line(_box([start, wave_y + (start - x) * slope, end, wave_y + (end - x) * slope], scale),
+                  fill='white', width=_width(2, scale))
+
+    # Draw bubbles
+    bubble_size = 8
+    for j in range(3):
+        bubble_x = bottle_x + 20 + j * 20
+        bubble_y = geometry['bubble_y']
+        draw.ellipse(_box([bubble_x, bubble_y, bubble_x + bubble_size, bubble_y + bubble_size], scale),
+                     fill='white', outline='black', width=_width(1, scale))
+
+    return img
+
+
+# name -> (geometry table, frame renderer)
+ANIMATIONS = {
+    'blink_eyes': (eyes_geometry, draw_eyes),
+    'water_bottle': (bottle_geometry, draw_bottle),
+}
+
+
+def _render(job):
+    name, geometry, scale = job
+    return ANIMATIONS[name][1](geometry, scale)
+
+
+def output_path(output_dir, name, scale):
+    suffix = '' if scale == 1 else f'@{scale:g}x'
+    return os.path.join(output_dir, f'{name}{suffix}.gif')
+
+
+def shared_palette(frames):
+    """Quantize all frames together into one palette; returns (palette image, transparent index)"""
+    width, height = frames[0].size
+    sheet = Image.new('RGB', (width, height * len(frames)))
+    for i, frame in enumerate(frames):
+        sheet.paste(frame.convert('RGB'), (0, i * height), frame)
+    palette = sheet.quantize(colors=MAX_COLORS, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    # Keep the table as small as the colors used, so LZW codes stay short
+    used = max(index for _, index in palette.getcolors()) + 1
+    palette.putpalette(palette.getpalette()[:used * 3] + [0, 0, 0])
+    return palette, used
+
+
+def _opaque_mask(frame):
+    return frame.getchannel('A').point(lambda a: 255 if a >= ALPHA_THRESHOLD else 0)
+
+
+def save_gif(frames, path):
+    """Write frames as a delta-encoded GIF with one global palette.
+
+    Each frame after the first only stores the rectangle that changed since
+    the previous one (Pillow crops it), drawn over the previous frame. A frame
+    is restored to the background instead when the next one turns opaque
+    pixels transparent, since drawing over it could not clear them.
+    """
+    palette, transparent_index = shared_palette(frames)
+    masks = [_opaque_mask(frame) for frame in frames]
+    indexed = []
+    for frame, mask in zip(frames, masks):
+        image = frame.convert('RGB').quantize(palette=palette, dither=Image.Dither.NONE)
+        image.paste(transparent_index, mask=ImageChops.invert(mask))
+        indexed.append(image)
+
+    # The last frame is followed by the first one when the animation loops
+    disposal = [2 if ImageChops.subtract(mask, masks[(i + 1) % len(masks)]).getbbox() else 1
+                for i, mask in enumerate(masks)]
+    indexed[0].save(path,
+                    save_all=True,
+                    append_images=indexed[1:],
+                    duration=FRAME_DURATION,
+                    transparency=transparent_index,
+                    disposal=disposal,
+                    optimize=False,  # keep the shared palette instead of a local one per frame
+                    loop=0)  # Loop forever
+
+
+def gif_report(path):
+    """Return (file bytes, pixels stored across frames, full-frame pixels, decode ms) for a GIF"""
+    size = os.path.getsize(path)
+    start = time.perf_counter()
+    with Image.open(path) as gif:
+        stored = 0
+        for frame in range(gif.n_frames):
+            gif.seek(frame)
+            left, top, right, bottom = gif.dispose_extent
+            stored += (right - left) * (bottom - top)
+            gif.convert('RGBA')
+        full = gif.width * gif.height * gif.n_frames
+    return size, stored, full, (time.perf_counter() - start) * 1000
+
+
+def file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def write_atlas(animations, path, frame_size=ATLAS_FRAME_SIZE, sources=None):
+    """Pack every frame of every animation into one PNG plus a JSON index next to it.
+
+    Frames are scaled to fit `frame_size` and laid out one animation per row;
+    identical frames share a rectangle. The index maps each animation name to
+    its frame rectangles [x, y, width, height] and durations in ms, plus the
+    SHA-1 of the GIF it was made from (`sources` maps name -> GIF path), so
+    the notifier only uses atlas frames for that exact file.
+    """
+    rows = []
+    for name, frames in animations.items():
+        scaled = []
+        for frame in frames:
+            frame = frame.copy()
+            frame.thumbnail(frame_size, Image.Resampling.LANCZOS)
+            scaled.append(frame)
+        rows.append((name, scaled))
+
+    width = max(sum(frame.width for frame in frames) for _, frames in rows)
+    height = sum(max(frame.height for frame in frames) for _, frames in rows)
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    index = {'image': os.path.basename(os.path.splitext(path)[0] + '.png'), 'animations': {}}
+    y = 0
+    for name, frames in rows:
+        x = 0
+        placed = {}  # pixel hash -> rectangle, so repeated frames are stored once
+        rects = []
+        for frame in frames:
+            digest = hashlib.sha1(frame.tobytes()).digest()
+            if digest not in placed:
+                atlas.paste(frame, (x, y))
+                placed[digest] = [x, y, frame.width, frame.height]
+                x += frame.width
+            rects.append(placed[digest])
+        index['animations'][name] = {'frames': rects, 'durations': [FRAME_DURATION] * len(frames)}
+        if sources and name in sources:
+            index['animations'][name]['source_sha1'] = file_sha1(sources[name])
+        y += max(frame.height for frame in frames)
+
+    png_path = os.path.join(os.path.dirname(path), index['image'])
+    atlas.save(png_path, optimize=True)
+    with open(path, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    return png_path
+
+
+def generate(names=None, scales=(1,), output_dir='assets', jobs=None, atlas=False):
+    """Render every frame of every animation at every scale across a process pool"""
+    names = names or list(ANIMATIONS)
+    targets = [(name, scale) for name in names for scale in scales]
+    work = [[(name, geometry, scale) for geometry in ANIMATIONS[name][0]()] for name, scale in targets]
+
+    flat = [job for batch in work for job in batch]
+    if jobs == 1:
+        frames = list(map(_render, flat))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # One flat map keeps every worker busy instead of waiting per animation
+            frames = list(pool.map(_render, flat, chunksize=4))
+
+    paths = []
+    rendered = {}  # scale -> {name: frames}
+    start = 0
+    for (name, scale), batch in zip(targets, work):
+        path = output_path(output_dir, name, scale)
+        batch_frames = frames[start:start + len(batch)]
+        save_gif(batch_frames, path)
+        rendered.setdefault(scale, {})[name] = batch_frames
+        start += len(batch)
+        paths.append(path)
+
+    if atlas:
+        for scale, animations in rendered.items():
+            suffix = '' if scale == 1 else f'@{scale:g}x'
+            frame_size = (int(ATLAS_FRAME_SIZE[0] * scale), int(ATLAS_FRAME_SIZE[1] * scale))
+            sources = {name: output_path(output_dir, name, scale) for name in animations}
+            paths.append(write_atlas(animations, os.path.join(output_dir, f'animations{suffix}.json'), frame_size,
+                                     sources))
+    return paths
+
+
+def create_blinking_eyes(scales=(1,), output_dir='assets'):
+    return generate(['blink_eyes'], scales, output_dir)
+
+
+def create_water_bottle(scales=(1,), output_dir='assets'):
+    return generate(['water_bottle'], scales, output_dir)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the notification animations")
+    parser.add_argument('--scale', type=float, action='append',
+                        help="output scale, repeatable (default 1; e.g. --scale 1 --scale 2 for HiDPI)")
+    parser.add_argument('--animation', action='append', choices=sorted(ANIMATIONS), help="only these animations")
+    parser.add_argument('--output-dir', default='assets')
+    parser.add_argument('--jobs', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--atlas', action='store_true',
+                        help="also write every frame into one sprite-atlas PNG with a JSON index")
+    args = parser.parse_args()
+
     # Create assets directory if it doesn't exist
-    if not os.path.exists('assets'):
-        os.makedirs('assets')
-    
-    # Generate both animations
-    create_blinking_eyes()
-    create_water_bottle()
-    print("Animations generated successfully!")
+    if not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    start = time.perf_counter()
+    paths = generate(args.animation, args.scale or [1], args.output_dir, args.jobs, args.atlas)
+    for path in paths:
+        if not path.endswith('.gif'):
+            print(f"  {path}: {os.path.getsize(path) / 1024:.1f} KB atlas")
+            continue
+        size, stored, full, decode_ms = gif_report(path)
+        print(f"  {path}: {size / 1024:.1f} KB, {stored * 100 / full:.0f}% of frame pixels stored, "
+              f"decodes in {decode_ms:.1f} ms")
+    print(f"Animations generated successfully in {time.perf_counter() - start:.2f}s!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,48 +1,46 @@
-import json
+import sys
+import startup_profile
+if "--profile-startup" in sys.argv:
+    # Before the imports below, so the report covers the project modules too
+    startup_profile.enable()
 import os
 import threading
 import time
 from datetime import datetime
-from notifier import Notifier
-from settings import SettingsWindow
-import pystray
-from PIL import Image, ImageDraw, ImageFont, ImageTk
-import tkinter as tk
 import traceback
-import sys
+from config_store import get_store
+from metrics import registry
+from paths import cache_dir
 
 sys.stdout.reconfigure(encoding='utf-8')
 
 def show_error(title, message):
+    import tkinter as tk
+    from tkinter import messagebox
     root = tk.Tk()
     root.withdraw()
-    tk.messagebox.showerror(title, message)
+    messagebox.showerror(title, message)
     root.destroy()
 
 def load_settings():
     try:
-        if os.path.exists('config.json'):
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        else:
-            default = {
-                "muted": False,
-                "autostart": False,
-                "theme": "light",
-                "notification_frequency_minutes": 1,
-                "notification_duration": 8,
-                "notification_types": ["eye", "hydration", "stretch"],
-                "quote_tone": "humorous",
-                "notification_position": "bottom-right",
-                "custom_message": "",
-                "animation": {
-                    "eye": "assets/blink_eyes.gif",
-                    "hydration": "assets/water_bottle.gif"
-                }
+        default = {
+            "muted": False,
+            "autostart": False,
+            "theme": "light",
+            "notification_frequency_minutes": 1,
+            "notification_duration": 8,
+            "notification_types": ["eye", "hydration", "stretch"],
+            "quote_tone": "humorous",
+            "notification_position": "bottom-right",
+            "custom_message": "",
+            "animation": {
+                "eye": "assets/blink_eyes.gif",
+                "hydration": "assets/water_bottle.gif"
             }
-            with open('config.json', 'w') as f:
-                json.dump(default, f, indent=4)
-            return default
+        }
+        # A missing config.json is seeded with the defaults by the store's background writer
+        return get_store().load(default)
     except Exception as e:
         show_error("Settings Error", f"Error loading settings: {str(e)}")
         return {}
@@ -56,89 +54,115 @@ def get_greeting():
     else:
         return "Good evening! 🌙", "Time to unwind and reflect on a productive day!"
 
-quotes = {
-    "eye": "Look away from the screen and relax your eyes. Time for a little break!",
-    "hydration": "Stay hydrated and feel your best - grab a glass of water and refresh yourself! 💧",
-    "stretch": "Take a deep breath, stretch your body, and feel refreshed for a productive day ahead!"
-}
-
 class SoukyaApp:
     def __init__(self):
         try:
             print("Initializing Soukya application")
+            from notifier import Notifier
             self.settings = load_settings()
             self.notifier = Notifier(self.settings)
-            self.icon = self.create_tray_icon()
+            self.icon = None
+            self.tray_icons = None
+            self.icon_state = None
             self.settings_window = None
+            get_store().subscribe(self.on_settings_changed)
         except Exception as e:
             show_error("Initialization Error", f"Error initializing application: {str(e)}\n{traceback.format_exc()}")
             sys.exit(1)
 
     def create_tray_icon(self):
-        try:
-            icon_image = Image.new('RGB', (64, 64), color=(73, 109, 137))
-            draw = ImageDraw.Draw(icon_image)
-            draw.ellipse([4, 4, 60, 60], fill=(73, 109, 137), outline=(255, 255, 255), width=2)
+        # Imported here so pystray and PIL load on the tray thread, off the path to the first notification
+        import pystray
+        from tray_icon import TrayIcons
 
-            try:
-                font = ImageFont.truetype("arial.ttf", 40)
-            except:
-                font = ImageFont.load_default()
-
-            draw.text((22, 12), "S", fill=(255, 255, 255), font=font)
+        try:
+            self.tray_icons = TrayIcons()
+            # Load every state up front so mute changes only swap bitmaps
+            for state in ('normal', 'muted'):
+                self.tray_icons.get(state)
+            self.icon_state = self.tray_state(get_store().get())
+            icon_image = self.tray_icons.get(self.icon_state)
 
             def on_settings():
-                if self.settings_window is None or not self.settings_window.window.winfo_exists():
-                    self.settings_window = SettingsWindow(self.notifier.root)
-                    self.settings_window.window.protocol("WM_DELETE_WINDOW", self.on_settings_close)
-                else:
-                    self.settings_window.window.lift()
-                    self.settings_window.window.focus_force()
+                self.notifier.call_soon(self.open_settings)
+
+            def on_diagnostics():
+                def open_diagnostics():
+                    from diagnostics import DiagnosticsWindow
+                    DiagnosticsWindow(self.notifier.root)
+                self.notifier.call_soon(open_diagnostics)
 
             def on_exit():
+                get_store().flush()
                 self.icon.stop()
                 os._exit(0)
 
             icon = pystray.Icon("Soukya", icon_image, "Soukya - Wellness Notifier", menu=pystray.Menu(
                 pystray.MenuItem("Open Settings", on_settings),
+                pystray.MenuItem("Diagnostics", on_diagnostics),
                 pystray.MenuItem("Exit", on_exit)
             ))
 
             threading.Thread(target=lambda: time.sleep(1), daemon=True).start()
             return icon
         except Exception as e:
-            show_error("Tray Icon Error", f"Error creating tray icon: {str(e)}\n{traceback.format_exc()}")
-            sys.exit(1)
+            # Runs on the tray thread, so report without opening a second Tk root
+            print(f"Error creating tray icon: {str(e)}\n{traceback.format_exc()}")
+            return None
+
+    def tray_state(self, settings=None):
+        return 'muted' if (settings or self.settings).get('muted', False) else 'normal'
 
-    def on_settings_close(self):
-        if self.settings_window and self.settings_window.window.winfo_exists():
-            self.settings_window.window.destroy()
-        self.settings_window = None
+    def on_settings_changed(self, settings):
+        # Called from whichever thread changed the settings; pystray redraws the icon itself
+        state = self.tray_state(settings)
+        if self.icon is not None and self.tray_icons is not None and state != self.icon_state:
+            self.icon_state = state
+            self.icon.icon = self.tray_icons.get(state)
+
+    def run_tray_icon(self):
+        try:
+            self.icon = self.create_tray_icon()
+            if self.icon is None:
+                return
+            startup_profile.mark('tray_icon')
+            self.icon.run()
+        except Exception as e:
+            print(f"Error running tray icon: {str(e)}\n{traceback.format_exc()}")
+
+    def open_settings(self):
+        # Built once on the Tk thread; later opens just refresh and show the hidden window
+        if self.settings_window is None:
+            from settings import SettingsWindow
+            self.settings_window = SettingsWindow(self.notifier.root)
+        self.settings_window.show()
 
     def show_initial_notifications(self):
         try:
             print("Showing initial notifications")
             title, message = get_greeting()
             self.notifier.show_notification(title, message, "greeting")
-
-            def show_test_notifications():
-                print("Starting test notifications")
-                time.sleep(10)
-                self.notifier.show_notification("Look Away", quotes["eye"], "eye")
-                time.sleep(20)
-                self.notifier.show_notification("Hydration Break", quotes["hydration"], "hydration")
-                time.sleep(20)
-                self.notifier.show_notification("Stretch & Breathe", quotes["stretch"], "stretch")
-
-            threading.Thread(target=show_test_notifications, daemon=True).start()
         except Exception as e:
             show_error("Notification Error", f"Error showing notifications: {str(e)}\n{traceback.format_exc()}")
 
+    def start_metrics_flusher(self):
+        # The metrics file is optional, so an unusable cache folder must not stop the app
+        try:
+            path = os.path.join(cache_dir(), 'metrics.json')
+        except OSError as e:
+            print(f"Not writing metrics, cache folder unavailable: {str(e)}")
+            return
+        registry.start_flusher(path, self.settings.get('metrics_flush_seconds', 60))
+
     def run(self):
         try:
             print("Starting Soukya application")
             self.show_initial_notifications()
-            threading.Thread(target=self.icon.run, daemon=True).start()
+            self.start_metrics_flusher()
+            if "--track-leaks" in sys.argv or self.settings.get('leak_tracking', False):
+                from diagnostics import LeakTracker
+                LeakTracker(self.notifier.root, self.settings.get('leak_tracking_interval', 300)).start()
+            threading.Thread(target=self.run_tray_icon, daemon=True).start()
             self.notifier.run()
         except Exception as e:
             show_error("Runtime Error", f"Error running application: {str(e)}\n{traceback.format_exc()}")
@@ -0,0 +1,140 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+# Bucket upper bounds in seconds, from sub-millisecond renders to reminders minutes late
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1, 2.5, 5, 10, 30, 60, 300)
+
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and a few additions"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'max': self.max
+        }
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms, with an optional JSON file flusher.
+
+    Look metrics up once and keep the object; recording on it afterwards
+    takes no locks.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        self.started = time.time()
+
+    def _get(self, name, factory):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, factory())
+        return metric
+
+    def counter(self, name):
+        return self._get(name, Counter)
+
+    def gauge(self, name):
+        return self._get(name, Gauge)
+
+    def histogram(self, name, bounds=DEFAULT_BUCKETS):
+        return self._get(name, lambda: Histogram(bounds))
+
+    def snapshot(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'metrics': {name: metric.snapshot() for name, metric in sorted(metrics.items())}
+        }
+
+    def write_json(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=4)
+        os.replace(tmp_path, path)
+
+    def start_flusher(self, path, interval=60):
+        """Write a snapshot to `path` every `interval` seconds from a daemon thread"""
+        if self._flusher is not None:
+            return
+
+        def flush_periodically():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_json(path)
+                except OSError as e:
+                    print(f"Error writing metrics: {str(e)}")
+
+        self._flusher = threading.Thread(target=flush_periodically, daemon=True)
+        self._flusher.start()
+
+
+registry = MetricsRegistry()
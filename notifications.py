@@ -0,0 +1,99 @@
+import time
+from queue import Queue, Empty
+from metrics import registry
+
+DIGEST_MAX_ITEMS = 6
+DIGEST_LINE_LENGTH = 48
+
+_queue_depth = registry.gauge('notification_queue_depth')
+_latency = registry.histogram('notification_latency_seconds')
+_render_time = registry.histogram('notification_render_seconds')
+_shown = registry.counter('notifications_shown')
+
+
+class Notification:
+    """What to show, independent of how a renderer presents it"""
+
+    def __init__(self, title, message, notification_type="greeting", duration_ms=8000, items=None):
+        self.title = title
+        self.message = message
+        self.notification_type = notification_type
+        self.duration_ms = duration_ms
+        self.items = items or [self]  # the queued notifications a digest stands for
+        self.created = time.perf_counter()
+
+    def __repr__(self):
+        return f"Notification({self.title!r}, {self.notification_type!r})"
+
+
+def format_digest(batch):
+    """Summarise several queued notifications as one toast's title and message"""
+    lines = []
+    for notification in batch[:DIGEST_MAX_ITEMS]:
+        line = f"• {notification.title}"
+        first_line = notification.message.split("\n", 1)[0]
+        if first_line:
+            line += f" — {first_line}"
+        if len(line) > DIGEST_LINE_LENGTH:
+            line = line[:DIGEST_LINE_LENGTH - 1] + "…"
+        lines.append(line)
+    if len(batch) > DIGEST_MAX_ITEMS:
+        lines.append(f"+{len(batch) - DIGEST_MAX_ITEMS} more")
+    return f"{len(batch)} reminders", "\n".join(lines)
+
+
+class NotificationQueue:
+    """Thread-safe queue in front of a renderer.
+
+    submit() may be called from any thread and calls `wake` so the renderer's
+    thread runs process(), which drains everything queued so far and shows it
+    as one notification (a digest when several are pending).
+    """
+
+    def __init__(self, renderer, wake=None, duration_ms=8000):
+        self.renderer = renderer
+        self.wake = wake
+        self.duration_ms = duration_ms
+        self._queue = Queue()
+
+    def submit(self, title, message, notification_type="greeting"):
+        notification = Notification(title, message, notification_type, self.duration_ms)
+        self._queue.put(notification)
+        _queue_depth.set(self._queue.qsize())
+        if self.wake is not None:
+            self.wake()
+        return notification
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except Empty:
+                return batch
+
+    def process(self):
+        batch = self.drain()
+        _queue_depth.set(self._queue.qsize())
+        if not batch:
+            return None
+        if len(batch) == 1:
+            notification = batch[0]
+        else:
+            title, message = format_digest(batch)
+            notification = Notification(title, message, "digest", self.duration_ms, items=batch)
+        start = time.perf_counter()
+        try:
+            self.renderer.show(notification)
+        except Exception as e:
+            print(f"Error in notification processing: {str(e)}")
+            return notification
+        end = time.perf_counter()
+        _render_time.observe(end - start)
+        for item in batch:
+            _latency.observe(end - item.created)
+        _shown.inc(len(batch))
+        return notification
@@ -0,0 +1,13 @@
+import os
+import sys
+
+
+def cache_dir(*parts):
+    """Return (and create) a directory under Soukya's per-user cache folder"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'soukya', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
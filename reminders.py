@@ -0,0 +1,98 @@
+import bisect
+import uuid
+
+
+def new_reminder_id():
+    return uuid.uuid4().hex[:12]
+
+
+def ensure_reminder_ids(reminders):
+    """Give every reminder a stable "id"; returns True if any were missing"""
+    changed = False
+    seen = set()
+    for reminder in reminders:
+        if not reminder.get("id") or reminder["id"] in seen:
+            reminder["id"] = new_reminder_id()
+            changed = True
+        seen.add(reminder["id"])
+    return changed
+
+
+def reminder_terms(reminder):
+    """Searchable terms of a reminder: title words, day names and time parts"""
+    terms = set(reminder.get("title", "").lower().split())
+    terms.update(day.lower() for day in reminder.get("days", []))
+    time_str = reminder.get("time", "").lower()
+    terms.update(time_str.split())
+    terms.add(time_str.replace(" ", ""))  # "02:30pm"
+    return terms
+
+
+class ReminderIndex:
+    """Prefix index over reminder titles, days and times, keyed by reminder id.
+
+    Terms are kept in one sorted list, so each query word is a bisect plus a
+    walk over the matching range. A query that extends the previous one only
+    filters the previous result, which keeps search-as-you-type cheap.
+    """
+
+    def __init__(self, reminders=()):
+        self.order = []  # reminder ids in list order
+        self.reminders = {}  # id -> reminder
+        self._terms = []  # sorted (term, id)
+        self._last_query = None
+        self._last_result = None
+        # Bulk load with one sort rather than an insort per term
+        for reminder in reminders:
+            self.order.append(reminder["id"])
+            self.reminders[reminder["id"]] = reminder
+            self._terms.extend((term, reminder["id"]) for term in reminder_terms(reminder))
+        self._terms.sort()
+
+    def __len__(self):
+        return len(self.order)
+
+    def add(self, reminder):
+        reminder_id = reminder["id"]
+        self.order.append(reminder_id)
+        self.reminders[reminder_id] = reminder
+        for term in reminder_terms(reminder):
+            bisect.insort(self._terms, (term, reminder_id))
+        self._last_query = None
+
+    def remove(self, reminder_id):
+        reminder = self.reminders.pop(reminder_id, None)
+        if reminder is None:
+            return
+        self.order.remove(reminder_id)
+        for term in reminder_terms(reminder):
+            index = bisect.bisect_left(self._terms, (term, reminder_id))
+            if index < len(self._terms) and self._terms[index] == (term, reminder_id):
+                del self._terms[index]
+        self._last_query = None
+
+    def _prefix_ids(self, prefix):
+        ids = set()
+        index = bisect.bisect_left(self._terms, (prefix, ''))
+        while index < len(self._terms) and self._terms[index][0].startswith(prefix):
+            ids.add(self._terms[index][1])
+            index += 1
+        return ids
+
+    def search(self, query):
+        """Return ids, in list order, of reminders matching every word of `query`"""
+        query = query.strip().lower()
+        if not query:
+            result = list(self.order)
+        else:
+            matches = None
+            for word in query.split():
+                ids = self._prefix_ids(word)
+                matches = ids if matches is None else matches & ids
+            # Typing more can only narrow the previous result, so filter that instead of the whole list
+            narrowing = self._last_query and query.startswith(self._last_query)
+            candidates = self._last_result if narrowing else self.order
+            result = [reminder_id for reminder_id in candidates if reminder_id in matches]
+        self._last_query = query
+        self._last_result = result
+        return result
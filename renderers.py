@@ -0,0 +1,114 @@
+import time
+from toast_layout import TOAST_WIDTH, stack_positions, toast_height
+
+
+class Renderer:
+    """Presents Notifications; implementations decide what "showing" means"""
+
+    def show(self, notification):
+        raise NotImplementedError
+
+    def hide_all(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TkRenderer(Renderer):
+    """Shows notifications as pooled Tk toast windows"""
+
+    def __init__(self, notifier, pool_size=3):
+        # Imported here so headless use never loads PIL or needs a display
+        from toast import ToastPool
+        self.pool = ToastPool(notifier, pool_size)
+
+    def show(self, notification):
+        self.pool.show(notification.title, notification.message,
+                       notification.notification_type, notification.duration_ms)
+
+    def hide_all(self):
+        self.pool.hide_all()
+
+    def close(self):
+        self.pool.destroy()
+
+
+class RenderedNotification:
+    """What HeadlessRenderer recorded for one shown notification"""
+
+    def __init__(self, notification, x, y, width, height, shown_at, render_seconds, animation_frames=0):
+        self.notification = notification
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.lines = notification.message.split('\n')
+        self.shown_at = shown_at
+        self.render_seconds = render_seconds
+        self.animation_frames = animation_frames
+        # A digest is as late as the oldest notification it stands for
+        self.latency = shown_at - min(item.created for item in notification.items)
+        self.expires_at = shown_at + notification.duration_ms / 1000.0
+
+    def __repr__(self):
+        return (f"RenderedNotification({self.notification.title!r}, {self.width}x{self.height}"
+                f"+{self.x}+{self.y}, latency={self.latency * 1000:.2f}ms)")
+
+
+class HeadlessRenderer(Renderer):
+    """Records notifications in memory instead of drawing them.
+
+    Layout follows the Tk toasts (size, stacking, pool recycling) so the
+    queue, scheduler and render paths can be exercised and timed on a machine
+    without a display. `animation_loader(notification_type)` may return the
+    frames for a type; like the Tk path they are loaded on first use and kept.
+    """
+
+    def __init__(self, screen_width=1920, screen_height=1080, pool_size=3, clock=time.perf_counter,
+                 animation_loader=None):
+        self.animation_loader = animation_loader
+        self.animations = {}
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.pool_size = pool_size
+        self.clock = clock
+        self.rendered = []
+        self.visible = []  # RenderedNotifications on screen, oldest first
+
+    def show(self, notification):
+        start = self.clock()
+        self._expire(start)
+        if len(self.visible) >= self.pool_size:
+            self.visible.pop(0)
+
+        height = toast_height(notification.message)
+        heights = [record.height for record in self.visible] + [height]
+        positions = stack_positions(heights, self.screen_width, self.screen_height)
+        for record, (x, y) in zip(self.visible, positions):
+            record.x, record.y = x, y
+
+        frames = self._animation(notification.notification_type)
+        x, y = positions[-1]
+        end = self.clock()
+        record = RenderedNotification(notification, x, y, TOAST_WIDTH, height, end, end - start, len(frames))
+        self.visible.append(record)
+        self.rendered.append(record)
+        return record
+
+    def _animation(self, notification_type):
+        if self.animation_loader is None:
+            return ()
+        if notification_type not in self.animations:
+            self.animations[notification_type] = self.animation_loader(notification_type) or ()
+        return self.animations[notification_type]
+
+    def _expire(self, now):
+        self.visible = [record for record in self.visible if record.expires_at > now]
+
+    def hide_all(self):
+        self.visible = []
+
+    def clear(self):
+        self.rendered = []
+        self.visible = []
@@ -0,0 +1,317 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from config_store import setting_number
+from metrics import registry
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+CATCH_UP_POLICIES = ("once", "all", "drop")
+
+# The monotonic clock stops during suspend on some platforms, so long sleeps
+# are capped to re-check the wall clock at least this often
+WALL_CHECK_INTERVAL = 60
+# A wall/monotonic disagreement larger than this is treated as a clock jump
+JUMP_THRESHOLD = 5
+LATENESS_HISTORY = 50
+# Shortest repeat for periodic reminders, so a tiny frequency can't turn into a toast every second
+MIN_PERIODIC_INTERVAL = 60
+# Pause after an unexpected error in the scheduler loop before trying again
+ERROR_RETRY_SECONDS = 5
+
+_lateness = registry.histogram('reminder_lateness_seconds')
+
+
+def reminder_key(reminder):
+    """Identity of a custom reminder, used to diff reminder lists"""
+    return (reminder["title"], tuple(reminder["days"]), reminder["time"])
+
+
+def parse_reminder_time(time_str):
+    """Parse a reminder time such as "02:30 PM" into (hour, minute)"""
+    parsed = datetime.strptime(time_str.strip(), "%I:%M %p")
+    return parsed.hour, parsed.minute
+
+
+def reminder_slots(reminder):
+    """Return the (weekday, minute-of-day) slots a reminder fires in"""
+    hour, minute = parse_reminder_time(reminder["time"])
+    minute_of_day = hour * 60 + minute
+    return sorted({(DAYS.index(day), minute_of_day) for day in reminder["days"] if day in DAYS})
+
+
+def next_slot_time(slot, after):
+    """Return the first datetime strictly after `after` that falls in `slot`"""
+    weekday, minute_of_day = slot
+    fire_time = after.replace(hour=minute_of_day // 60, minute=minute_of_day % 60, second=0, microsecond=0)
+    fire_time += timedelta(days=(weekday - fire_time.weekday()) % 7)
+    if fire_time <= after:
+        fire_time += timedelta(days=7)
+    return fire_time
+
+
+class ReminderScheduler:
+    """Fires custom reminders and periodic wellness reminders at their due times.
+
+    Reminders are compiled into an index keyed by (weekday, minute-of-day), so
+    everything due in a minute comes from one dict lookup. Each occupied slot
+    has its next fire time in a min-heap, and the worker thread sleeps until
+    the earliest deadline instead of waking up every minute to compare strings.
+    Periodic wellness timers (eye, hydration, ...) share the same heap and
+    thread; each one repeats every `interval` seconds plus a random jitter so
+    the types don't all fire together.
+
+    Sleeps run on the monotonic clock and every wakeup is checked against the
+    wall clock. Reminders more than `reminder_stale_seconds` late (missed
+    during a suspend or a clock jump) follow `reminder_catch_up`: "once" fires
+    each missed reminder a single time, "all" fires every missed occurrence
+    and "drop" skips them.
+    """
+
+    def __init__(self, on_due, on_periodic=None):
+        self.on_due = on_due
+        self.on_periodic = on_periodic
+        self._reminders = {}  # reminder key -> (reminder, slots)
+        self._index = {}  # (weekday, minute-of-day) -> {reminder key: reminder}
+        self._periodic = {}  # notification type -> (interval seconds, anchor datetime)
+        self._deadlines = {}  # ("slot", slot) or ("periodic", type) -> scheduled fire time
+        self._heap = []  # (fire_time, seq, kind, key)
+        self.jitter = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._last_clock_check = None
+        self.catch_up = "once"
+        self.stale_after = 300
+        self._last_fired = {}  # slot -> fire time it last fired for
+        self.lateness = {}  # reminder key -> recent fire lateness in seconds
+
+    def configure(self, settings):
+        catch_up = settings.get("reminder_catch_up", "once")
+        stale_after = setting_number(settings, "reminder_stale_seconds", 300)
+        if catch_up not in CATCH_UP_POLICIES:
+            print(f"Unknown reminder_catch_up policy {catch_up!r}, using 'once'")
+            catch_up = "once"
+        with self._cond:
+            self.catch_up = catch_up
+            self.stale_after = stale_after
+
+    @staticmethod
+    def _start_of_minute():
+        # Reminders that are due in the current minute still fire when added
+        now = datetime.now()
+        return now.replace(second=0, microsecond=0) - timedelta(microseconds=1)
+
+    def set_reminders(self, reminders):
+        """Replace the reminder list, updating the index only for entries that changed"""
+        wanted = {}
+        for reminder in reminders:
+            try:
+                wanted[reminder_key(reminder)] = reminder
+            except (KeyError, TypeError):
+                print(f"Skipping malformed reminder: {reminder}")
+
+        with self._cond:
+            after = self._start_of_minute()
+            for key in self._reminders.keys() - wanted.keys():
+                self._remove(key)
+            for key, reminder in wanted.items():
+                if key not in self._reminders:
+                    self._add(key, reminder, after)
+            self._cond.notify()
+
+    def add_reminder(self, reminder):
+        with self._cond:
+            key = reminder_key(reminder)
+            if key not in self._reminders:
+                self._add(key, reminder, self._start_of_minute())
+                self._cond.notify()
+
+    def remove_reminder(self, reminder):
+        with self._cond:
+            key = reminder_key(reminder)
+            # Reminders with an invalid time were never added
+            if key in self._reminders:
+                self._remove(key)
+
+    def _add(self, key, reminder, after):
+        try:
+            slots = reminder_slots(reminder)
+        except ValueError:
+            print(f"Skipping reminder with invalid time: {reminder}")
+            return
+        self._reminders[key] = (reminder, slots)
+        for slot in slots:
+            if slot not in self._index:
+                self._index[slot] = {}
+                self._schedule_slot(slot, after)
+            self._index[slot][key] = reminder
+
+    def _remove(self, key):
+        self.lateness.pop(key, None)
+        _, slots = self._reminders.pop(key)
+        for slot in slots:
+            due = self._index[slot]
+            del due[key]
+            if not due:
+                # The slot's heap entry goes stale and is skipped when popped
+                del self._index[slot]
+                del self._deadlines[("slot", slot)]
+                self._last_fired.pop(slot, None)
+
+    def set_periodic(self, notification_types, interval, jitter=0):
+        """Run one recurring timer per type every `interval` seconds (+ up to `jitter`).
+
+        Timers that already exist are rescheduled in place from their last
+        firing, so changing the frequency doesn't reset or restart anything.
+        """
+        interval = max(MIN_PERIODIC_INTERVAL, interval)
+        with self._cond:
+            self.jitter = max(0, jitter)
+            now = datetime.now()
+            for notification_type in self._periodic.keys() - set(notification_types):
+                del self._periodic[notification_type]
+                del self._deadlines[("periodic", notification_type)]
+            for notification_type in notification_types:
+                old = self._periodic.get(notification_type)
+                if old is not None and old[0] == interval:
+                    continue
+                anchor = old[1] if old is not None else now
+                self._periodic[notification_type] = (interval, anchor)
+                fire_time = max(now, anchor + timedelta(seconds=interval))
+                self._push(("periodic", notification_type), fire_time + self._jitter())
+            self._cond.notify()
+
+    def _jitter(self):
+        return timedelta(seconds=random.uniform(0, self.jitter)) if self.jitter else timedelta()
+
+    def _push(self, deadline, fire_time):
+        self._deadlines[deadline] = fire_time
+        heapq.heappush(self._heap, (fire_time, next(self._seq)) + deadline)
+
+    def _schedule_slot(self, slot, after):
+        self._push(("slot", slot), next_slot_time(slot, after))
+
+    def _check_clock(self):
+        """Detect wall-clock jumps by comparing elapsed wall and monotonic time"""
+        mono = time.monotonic()
+        wall = datetime.now()
+        if self._last_clock_check is not None:
+            last_mono, last_wall = self._last_clock_check
+            drift = (wall - last_wall).total_seconds() - (mono - last_mono)
+            if drift > JUMP_THRESHOLD:
+                # Overdue slots are caught up by _collect_due according to the policy
+                print(f"Wall clock jumped forward {drift:.0f}s (suspend or clock change)")
+            elif drift < -JUMP_THRESHOLD:
+                print(f"Wall clock jumped back {-drift:.0f}s, rescheduling reminders")
+                after = self._start_of_minute()
+                for slot in self._index:
+                    # A slot that already fired must not fire again when the clock replays its minute
+                    self._schedule_slot(slot, max(after, self._last_fired.get(slot, after)))
+                for notification_type, (interval, _) in self._periodic.items():
+                    self._periodic[notification_type] = (interval, wall)
+                    self._push(("periodic", notification_type), wall + timedelta(seconds=interval) + self._jitter())
+        self._last_clock_check = (mono, wall)
+
+    def _collect_due(self, now):
+        """Pop every deadline that has passed; returns ("reminder", reminder) and ("periodic", type) items"""
+        due = []
+        caught_up = set()
+        while self._heap and self._heap[0][0] <= now:
+            fire_time, _, kind, key = heapq.heappop(self._heap)
+            if self._deadlines.get((kind, key)) != fire_time:
+                continue
+            lateness = (now - fire_time).total_seconds()
+
+            if kind == "periodic":
+                # Missed periodic reminders always collapse into one, then the timer restarts from now
+                interval, _ = self._periodic[key]
+                self._periodic[key] = (interval, now)
+                self.lateness.setdefault(("periodic", key), deque(maxlen=LATENESS_HISTORY)).append(lateness)
+                _lateness.observe(lateness)
+                due.append(("periodic", key))
+                self._push(("periodic", key), now + timedelta(seconds=interval) + self._jitter())
+                continue
+
+            slot = key
+            fires = 1
+            if lateness > self.stale_after:
+                missed = int(lateness // (7 * 24 * 3600)) + 1
+                fires = {"all": missed, "drop": 0}.get(self.catch_up, 1)
+                print(f"{len(self._index[slot])} reminder(s) missed by {lateness:.0f}s, catch-up policy '{self.catch_up}'")
+
+            for key, reminder in self._index[slot].items():
+                # "once" fires a reminder missed in several slots a single time
+                if self.catch_up == "once" and lateness > self.stale_after:
+                    if key in caught_up:
+                        continue
+                    caught_up.add(key)
+                if fires:
+                    self.lateness.setdefault(key, deque(maxlen=LATENESS_HISTORY)).append(lateness)
+                    _lateness.observe(lateness)
+                due.extend([("reminder", reminder)] * fires)
+            self._last_fired[slot] = fire_time
+            self._schedule_slot(slot, now)
+        return due
+
+    def _pop_due(self):
+        """Wait for the earliest deadline and return the reminders that are due"""
+        with self._cond:
+            while self._running:
+                self._check_clock()
+
+                # Drop heap entries for timers that were removed or rescheduled
+                while self._heap:
+                    fire_time, _, kind, key = self._heap[0]
+                    if self._deadlines.get((kind, key)) == fire_time:
+                        break
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                now = datetime.now()
+                delay = (self._heap[0][0] - now).total_seconds()
+                if delay > 0:
+                    self._cond.wait(min(delay, WALL_CHECK_INTERVAL))
+                    continue
+
+                return self._collect_due(now)
+            return []
+
+    def _run(self):
+        while self._running:
+            try:
+                due = self._pop_due()
+            except Exception as e:
+                # One bad wakeup must not end the thread and silence every reminder
+                print(f"Error checking reminders: {str(e)}")
+                time.sleep(ERROR_RETRY_SECONDS)
+                continue
+            for kind, item in due:
+                try:
+                    if kind == "periodic":
+                        if self.on_periodic is not None:
+                            self.on_periodic(item)
+                    else:
+                        self.on_due(item)
+                except Exception as e:
+                    print(f"Error firing {kind} reminder: {str(e)}")
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
@@ -1,26 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
 from datetime import datetime, time
+from config_store import get_store
+from reminders import ReminderIndex, ensure_reminder_ids, new_reminder_id
+from virtual_list import VirtualList
 
 class SettingsWindow:
+    """Tabbed settings window that is built once and hidden, not destroyed, when closed.
+
+    Each tab's widgets are created the first time the tab is viewed, and
+    show() reloads every field from the latest config, so reopening the
+    window costs no rebuild.
+    """
+
     def __init__(self, parent=None):
+        self.standalone = parent is None
         self.window = tk.Toplevel(parent) if parent else tk.Tk()
         self.window.title("Soukya Settings")
         self.window.geometry("500x700")  # Made window taller
         self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
         
         # Make window stay on top
         self.window.attributes('-topmost', True)
         
-        # Load current settings
-        self.settings = self.load_settings()
-        
         # Set custom icon
         try:
-            icon_img = tk.PhotoImage(file="assets/image.png")
-            self.window.iconphoto(False, icon_img)
+            self.icon_img = tk.PhotoImage(file="assets/image.png")
+            self.window.iconphoto(False, self.icon_img)
         except Exception as e:
             print(f"Could not set window icon: {e}")
         
@@ -28,36 +35,89 @@ class SettingsWindow:
         main_container = ttk.Frame(self.window, padding="20")
         main_container.pack(fill=tk.BOTH, expand=True)
         
-        # Create a canvas and scrollbar for scrolling
-        canvas = tk.Canvas(main_container)
-        scrollbar = ttk.Scrollbar(main_container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack the canvas and scrollbar
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Create sections
-        self.create_general_section(scrollable_frame)
-        self.create_notification_section(scrollable_frame)
-        self.create_custom_reminders_section(scrollable_frame)  # New section
-        self.create_appearance_section(scrollable_frame)
-        self.create_quotes_section(scrollable_frame)
+        # Fields are backed by variables that exist before their tab is built
+        self.settings = {}
+        self.create_variables()
+        
+        # One tab per section, each filled in the first time it is selected
+        self.notebook = ttk.Notebook(main_container)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        self._builders = {}
+        for text, builder in (("General", self.create_general_section),
+                              ("Notifications", self.create_notification_section),
+                              ("Reminders", self.create_custom_reminders_section),
+                              ("Appearance", self.create_appearance_section),
+                              ("Messages", self.create_quotes_section)):
+            tab = ttk.Frame(self.notebook, padding="10")
+            self.notebook.add(tab, text=text)
+            self._builders[str(tab)] = (builder, tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
         
         # Save and Cancel buttons
         button_frame = ttk.Frame(main_container)
         button_frame.pack(fill=tk.X, pady=(10, 0))
         
         ttk.Button(button_frame, text="Save", command=self.save_settings).pack(side=tk.RIGHT, padx=5)
-        ttk.Button(button_frame, text="Cancel", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.hide).pack(side=tk.RIGHT, padx=5)
+        
+        self.refresh()
+        self.build_tab(self.notebook.select())
+    
+    def create_variables(self):
+        self.muted_var = tk.BooleanVar()
+        self.autostart_var = tk.BooleanVar()
+        self.frequency_var = tk.IntVar()
+        self.duration_var = tk.IntVar()
+        self.eye_var = tk.BooleanVar()
+        self.hydration_var = tk.BooleanVar()
+        self.stretch_var = tk.BooleanVar()
+        self.theme_var = tk.StringVar()
+        self.position_var = tk.StringVar()
+        self.quote_tone_var = tk.StringVar()
+        self.custom_message_var = tk.StringVar()
+        self.search_var = tk.StringVar()
+        self.reminder_list = None
+        self.reminder_index = None
+    
+    def refresh(self):
+        """Load the latest settings into every field"""
+        self.settings = self.load_settings()
+        self.settings.setdefault("custom_reminders", [])
+        notification_types = self.settings.get("notification_types", [])
+        self.muted_var.set(self.settings.get("muted", False))
+        self.autostart_var.set(self.settings.get("autostart", False))
+        self.frequency_var.set(self.settings.get("notification_frequency_minutes", 30))
+        self.duration_var.set(self.settings.get("notification_duration", 8))
+        self.eye_var.set("eye" in notification_types)
+        self.hydration_var.set("hydration" in notification_types)
+        self.stretch_var.set("stretch" in notification_types)
+        self.theme_var.set(self.settings.get("theme", "light"))
+        self.position_var.set(self.settings.get("notification_position", "bottom-right"))
+        self.quote_tone_var.set(self.settings.get("quote_tone", "humorous"))
+        self.custom_message_var.set(self.settings.get("custom_message", ""))
+        if self.reminder_list is not None:
+            self.load_reminders()
+    
+    def build_tab(self, tab_name):
+        entry = self._builders.pop(str(tab_name), None)
+        if entry is not None:
+            builder, tab = entry
+            builder(tab)
+    
+    def on_tab_changed(self, event):
+        self.build_tab(self.notebook.select())
+    
+    def show(self):
+        self.refresh()
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+    
+    def hide(self):
+        if self.standalone:
+            self.window.destroy()
+        else:
+            self.window.withdraw()
     
     def create_general_section(self, parent):
         # General Settings Section
@@ -65,11 +125,9 @@ class SettingsWindow:
         general_frame.pack(fill=tk.X, pady=10)
         
         # Mute toggle
-        self.muted_var = tk.BooleanVar(value=self.settings.get("muted", False))
         ttk.Checkbutton(general_frame, text="Mute All Notifications", variable=self.muted_var).pack(anchor=tk.W, pady=5)
         
         # Auto-start with Windows
-        self.autostart_var = tk.BooleanVar(value=self.settings.get("autostart", False))
         ttk.Checkbutton(general_frame, text="Start with Windows", variable=self.autostart_var).pack(anchor=tk.W, pady=5)
     
     def create_notification_section(self, parent):
@@ -79,22 +137,16 @@ class SettingsWindow:
         
         # Notification frequency
         ttk.Label(notification_frame, text="Notification Frequency (minutes):").pack(anchor=tk.W, pady=5)
-        self.frequency_var = tk.IntVar(value=self.settings.get("notification_frequency_minutes", 30))
         frequency_entry = ttk.Entry(notification_frame, textvariable=self.frequency_var, width=10)
         frequency_entry.pack(anchor=tk.W, pady=5)
         
         # Notification duration
         ttk.Label(notification_frame, text="Notification Display Duration (seconds):").pack(anchor=tk.W, pady=5)
-        self.duration_var = tk.IntVar(value=self.settings.get("notification_duration", 8))
         duration_entry = ttk.Entry(notification_frame, textvariable=self.duration_var, width=10)
         duration_entry.pack(anchor=tk.W, pady=5)
         
         # Notification types
         ttk.Label(notification_frame, text="Enable Notification Types:").pack(anchor=tk.W, pady=5)
-        self.eye_var = tk.BooleanVar(value="eye" in self.settings.get("notification_types", []))
-        self.hydration_var = tk.BooleanVar(value="hydration" in self.settings.get("notification_types", []))
-        self.stretch_var = tk.BooleanVar(value="stretch" in self.settings.get("notification_types", []))
-        
         ttk.Checkbutton(notification_frame, text="Eye Relaxation Reminders", variable=self.eye_var).pack(anchor=tk.W, pady=2)
         ttk.Checkbutton(notification_frame, text="Hydration Reminders", variable=self.hydration_var).pack(anchor=tk.W, pady=2)
         ttk.Checkbutton(notification_frame, text="Stretch Reminders", variable=self.stretch_var).pack(anchor=tk.W, pady=2)
@@ -107,23 +159,19 @@ class SettingsWindow:
         # List of current reminders
         ttk.Label(reminders_frame, text="Your Reminders:").pack(anchor=tk.W, pady=5)
         
-        # Create a frame for the listbox and scrollbar
-        list_frame = ttk.Frame(reminders_frame)
-        list_frame.pack(fill=tk.X, pady=5)
+        # Search as you type, by title words, day or time
+        search_frame = ttk.Frame(reminders_frame)
+        search_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        ttk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add("write", lambda *args: self.filter_reminders())
         
-        # Create listbox for reminders
-        self.reminders_listbox = tk.Listbox(list_frame, height=4)
-        self.reminders_listbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # Only the visible rows exist as canvas items, however many reminders there are
+        self.reminder_list = VirtualList(reminders_frame, self.format_reminder, rows=6)
+        self.reminder_list.pack(fill=tk.X, pady=5)
         
-        # Add scrollbar to listbox
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.reminders_listbox.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.reminders_listbox.configure(yscrollcommand=scrollbar.set)
-        
-        # Load existing reminders into listbox
-        self.custom_reminders = self.settings.get("custom_reminders", [])
-        for reminder in self.custom_reminders:
-            self.reminders_listbox.insert(tk.END, f"{reminder['title']} - {reminder['days']} at {reminder['time']}")
+        # Load existing reminders into the list
+        self.load_reminders()
         
         # Frame for adding new reminders
         add_frame = ttk.LabelFrame(reminders_frame, text="Add New Reminder", padding="10")
@@ -174,6 +222,25 @@ class SettingsWindow:
         ttk.Button(button_frame, text="Add Reminder", command=self.add_reminder).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Remove Selected", command=self.remove_reminder).pack(side=tk.LEFT, padx=2)
     
+    def load_reminders(self):
+        # Reminders are addressed by a stable id, so older configs get one the first time they are shown
+        if ensure_reminder_ids(self.settings["custom_reminders"]):
+            self.save_reminders()
+        self.reminder_index = ReminderIndex(self.settings["custom_reminders"])
+        self.filter_reminders()
+    
+    def filter_reminders(self):
+        if self.reminder_list is not None:
+            self.reminder_list.set_keys(self.reminder_index.search(self.search_var.get()))
+    
+    def format_reminder(self, reminder_id):
+        reminder = self.reminder_index.reminders[reminder_id]
+        return f"{reminder['title']} - {', '.join(reminder['days'])} at {reminder['time']}"
+    
+    def save_reminders(self):
+        # Reminder edits apply right away and leave the window open
+        get_store().update({"custom_reminders": self.settings["custom_reminders"]})
+    
     def add_reminder(self):
         """Add a new custom reminder"""
         title = self.reminder_title.get().strip()
@@ -195,17 +262,19 @@ class SettingsWindow:
         
         # Create reminder
         reminder = {
+            "id": new_reminder_id(),
             "title": title,
             "days": selected_days,
             "time": time_str
         }
         
-        # Add to listbox and settings
-        self.reminders_listbox.insert(tk.END, f"{title} - {', '.join(selected_days)} at {time_str}")
+        # Add to list and settings
         self.settings["custom_reminders"].append(reminder)
+        self.reminder_index.add(reminder)
+        self.filter_reminders()
         
         # Save settings
-        self.save_settings()
+        self.save_reminders()
         
         # Clear inputs
         self.reminder_title.delete(0, tk.END)
@@ -219,20 +288,20 @@ class SettingsWindow:
     
     def remove_reminder(self):
         """Remove selected reminder"""
-        selection = self.reminders_listbox.curselection()
-        if not selection:
+        reminder_id = self.reminder_list.selection()
+        if reminder_id is None:
             messagebox.showerror("Error", "Please select a reminder to remove")
             return
             
-        index = selection[0]
-        reminder = self.settings["custom_reminders"][index]
+        reminder = self.reminder_index.reminders[reminder_id]
         
-        # Remove from listbox and settings
-        self.reminders_listbox.delete(index)
-        self.settings["custom_reminders"].pop(index)
+        # Remove from list and settings, by id so filtering can't pick the wrong one
+        self.settings["custom_reminders"] = [r for r in self.settings["custom_reminders"] if r.get("id") != reminder_id]
+        self.reminder_index.remove(reminder_id)
+        self.filter_reminders()
         
         # Save settings
-        self.save_settings()
+        self.save_reminders()
         
         print(f"Removed reminder: {reminder}")  # Debug print
     
@@ -243,13 +312,11 @@ class SettingsWindow:
         
         # Theme selection
         ttk.Label(appearance_frame, text="Theme:").pack(anchor=tk.W, pady=5)
-        self.theme_var = tk.StringVar(value=self.settings.get("theme", "light"))
         theme_combo = ttk.Combobox(appearance_frame, textvariable=self.theme_var, values=["light", "dark", "system"])
         theme_combo.pack(anchor=tk.W, pady=5)
         
         # Notification position
         ttk.Label(appearance_frame, text="Notification Position:").pack(anchor=tk.W, pady=5)
-        self.position_var = tk.StringVar(value=self.settings.get("notification_position", "bottom-right"))
         position_combo = ttk.Combobox(appearance_frame, textvariable=self.position_var, 
                                     values=["top-right", "top-left", "bottom-right", "bottom-left"])
         position_combo.pack(anchor=tk.W, pady=5)
@@ -261,22 +328,17 @@ class SettingsWindow:
         
         # Quote tone
         ttk.Label(quotes_frame, text="Message Tone:").pack(anchor=tk.W, pady=5)
-        self.quote_tone_var = tk.StringVar(value=self.settings.get("quote_tone", "humorous"))
         quote_tone_combo = ttk.Combobox(quotes_frame, textvariable=self.quote_tone_var, 
                                       values=["humorous", "motivational", "minimal", "professional"])
         quote_tone_combo.pack(anchor=tk.W, pady=5)
         
         # Custom message
         ttk.Label(quotes_frame, text="Custom Message (optional):").pack(anchor=tk.W, pady=5)
-        self.custom_message_var = tk.StringVar(value=self.settings.get("custom_message", ""))
         custom_message_entry = ttk.Entry(quotes_frame, textvariable=self.custom_message_var, width=40)
         custom_message_entry.pack(anchor=tk.W, pady=5)
     
     def load_settings(self):
-        if os.path.exists('config.json'):
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        return {}
+        return get_store().get()
     
     def save_settings(self):
         """Save settings to config file"""
@@ -302,15 +364,15 @@ class SettingsWindow:
             # Remove None values from notification_types
             self.settings["notification_types"] = [t for t in self.settings["notification_types"] if t is not None]
             
-            with open('config.json', 'w') as f:
-                json.dump(self.settings, f, indent=4)
+            # Written to disk in the background by the config store
+            get_store().update(self.settings)
             print("Settings saved successfully")  # Debug print
             print(f"Custom reminders saved: {self.settings.get('custom_reminders', [])}")  # Debug print
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
             print(f"Error saving settings: {str(e)}")  # Debug print
         
-        self.window.destroy()
+        self.hide()
     
     def run(self):
         self.window.mainloop()
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Soak test for Tk resource leaks in the notification path.
+
+Shows and hides thousands of toasts through the real ModernNotifier (pooled
+windows, animations, digests, expiry) and compares widget, Tcl command,
+image and after() callback counts against a baseline taken after warm-up.
+The eye and hydration toasts play the real GIFs with a short idle time, so
+images are loaded, played and evicted over and over. Both counts are taken
+once the idle sweep has emptied the animation cache. With --atlas the GIFs
+and sprite atlas are generated into a temporary folder and loaded from it.
+Exits non-zero if anything grew. Needs a display.
+
+    python soak_leaks.py --cycles 5000
+"""
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tkinter as tk
+from diagnostics import tk_resource_counts
+
+MESSAGES = [
+    ("Look Away", "Relax your eyes for a moment.", "eye"),
+    ("Hydration Break", "Grab a glass of water.", "hydration"),
+    ("Stand up", "Take a short walk.\nRoll your shoulders.\nBreathe.", "greeting"),
+]
+HERE = os.path.dirname(os.path.abspath(__file__))
+IDLE_SECONDS = 0.2
+
+
+def soak_settings(asset_dir, atlas):
+    return {
+        'muted': False,
+        'animation': {
+            'eye': os.path.join(asset_dir, 'blink_eyes.gif'),
+            'hydration': os.path.join(asset_dir, 'water_bottle.gif'),
+        },
+        'animation_atlas': atlas,
+        'animation_idle_seconds': IDLE_SECONDS,
+    }
+
+
+def settle(root):
+    """Run the event loop until the idle sweep has evicted every animation"""
+    deadline = time.monotonic() + IDLE_SECONDS * 3
+    while time.monotonic() < deadline:
+        root.update()
+        time.sleep(0.01)
+    gc.collect()
+    root.update()
+
+
+def run_cycle(notifier, cycle):
+    root = notifier.root
+    queue = notifier.notification_queue
+    # Every third toast expires through its own after() callback
+    queue.duration_ms = 1 if cycle % 3 == 0 else 60000
+    if cycle % 10 == 0:
+        # A burst that is coalesced into a digest toast
+        for i in range(5):
+            queue.submit(f"Reminder {i}", "Time for your scheduled reminder!", "greeting")
+    else:
+        title, message, notification_type = MESSAGES[cycle % len(MESSAGES)]
+        queue.submit(title, message, notification_type)
+    queue.process()
+    root.update_idletasks()
+
+    if cycle % 3 == 0:
+        pool = notifier.renderer.pool
+        window = pool.active[-1]
+        while window.visible:
+            root.update()
+    elif cycle % 3 == 1:
+        notifier.renderer.hide_all()
+    # Otherwise leave it visible; the pool recycles the oldest window
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail if toasts leak Tk widgets, commands, images or timers")
+    parser.add_argument('--cycles', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100, help="cycles run before taking the baseline")
+    parser.add_argument('--atlas', action='store_true', help="load the animations from a freshly generated atlas")
+    args = parser.parse_args(argv)
+
+    if args.atlas:
+        import generate_animations
+        asset_dir = tempfile.mkdtemp(prefix='soak_assets_')
+        generate_animations.generate(output_dir=asset_dir, jobs=1, atlas=True)
+        settings = soak_settings(asset_dir, os.path.join(asset_dir, 'animations.json'))
+    else:
+        asset_dir = None
+        settings = soak_settings(HERE, None)
+
+    try:
+        return soak(settings, args.warmup, args.cycles)
+    finally:
+        if asset_dir:
+            shutil.rmtree(asset_dir, ignore_errors=True)
+
+
+def soak(settings, warmup, cycles):
+    try:
+        from notifier import ModernNotifier
+        notifier = ModernNotifier(settings)
+    except tk.TclError as e:
+        print(f"Cannot run the soak test without a display: {str(e)}", file=sys.stderr)
+        return 2
+
+    for cycle in range(warmup):
+        run_cycle(notifier, cycle)
+    notifier.renderer.hide_all()
+    settle(notifier.root)
+    baseline = tk_resource_counts(notifier.root)
+
+    for cycle in range(warmup, warmup + cycles):
+        run_cycle(notifier, cycle)
+    notifier.renderer.hide_all()
+    settle(notifier.root)
+    final = tk_resource_counts(notifier.root)
+
+    leaked = False
+    for name, before in baseline.items():
+        after = final[name]
+        status = "ok" if after <= before else "LEAK"
+        leaked = leaked or after > before
+        print(f"{name:<16} {before:>7} -> {after:>7}  {status}")
+    notifier.root.destroy()
+    return 1 if leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
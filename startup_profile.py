@@ -0,0 +1,80 @@
+import sys
+import time
+
+_start = time.perf_counter()
+_enabled = False
+_imports = []  # (module name, self seconds, cumulative seconds)
+_stack = []
+_marks = {}
+
+
+class _TimedLoader:
+    """Wraps a module loader to measure how long executing the module takes"""
+
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, 'create_module', None)
+        return create_module(spec) if create_module else None
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        _stack.append(0.0)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            children = _stack.pop()
+            elapsed = time.perf_counter() - start
+            if _stack:
+                _stack[-1] += elapsed
+            _imports.append((self._name, elapsed - children, elapsed))
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class _ImportTimer:
+    """Meta path finder that wraps the loader of every module imported after enable()"""
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, fullname)
+                return spec
+        return None
+
+
+def enable():
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        sys.meta_path.insert(0, _ImportTimer())
+
+
+def is_enabled():
+    return _enabled
+
+
+def mark(name):
+    """Record the first time a startup milestone is reached"""
+    if _enabled and name not in _marks:
+        _marks[name] = time.perf_counter() - _start
+        if name == 'first_notification':
+            report()
+
+
+def report(limit=15):
+    print("Startup profile")
+    print(f"  {'module':<40} {'self ms':>9} {'total ms':>9}")
+    for name, self_time, total_time in sorted(_imports, key=lambda entry: entry[2], reverse=True)[:limit]:
+        print(f"  {name:<40} {self_time * 1000:>9.1f} {total_time * 1000:>9.1f}")
+    total_import = sum(self_time for _, self_time, _ in _imports)
+    print(f"  {len(_imports)} modules imported in {total_import * 1000:.1f} ms")
+    for name, elapsed in sorted(_marks.items(), key=lambda item: item[1]):
+        print(f"  {name}: {elapsed * 1000:.1f} ms after start")
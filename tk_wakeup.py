@@ -0,0 +1,65 @@
+import os
+import threading
+import tkinter as tk
+
+
+class TkWakeup:
+    """Runs a callback on the Tk thread when another thread calls wake().
+
+    On Unix a self-pipe is registered with createfilehandler, so the mainloop
+    stays idle until a byte arrives. Elsewhere a virtual event is posted to
+    the root window, which threaded Tcl builds deliver to the Tk thread.
+    """
+
+    EVENT = '<<SoukyaWakeup>>'
+
+    def __init__(self, root, callback):
+        self.root = root
+        self.callback = callback
+        self._pending = False
+        self._lock = threading.Lock()
+        self._read_fd = None
+        self._write_fd = None
+
+        if hasattr(root.tk, 'createfilehandler'):
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._read_fd, False)
+            os.set_blocking(self._write_fd, False)
+            root.tk.createfilehandler(self._read_fd, tk.READABLE, self._on_readable)
+        else:
+            root.bind(self.EVENT, lambda event: self._dispatch())
+
+    def wake(self):
+        """Schedule the callback; repeated calls before it runs are coalesced"""
+        with self._lock:
+            if self._pending:
+                return
+            self._pending = True
+
+        if self._write_fd is not None:
+            try:
+                os.write(self._write_fd, b'\0')
+            except BlockingIOError:
+                pass
+        else:
+            self.root.event_generate(self.EVENT, when='tail')
+
+    def _on_readable(self, fd, mask):
+        try:
+            while os.read(fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+        self._dispatch()
+
+    def _dispatch(self):
+        with self._lock:
+            self._pending = False
+        self.callback()
+
+    def close(self):
+        if self._read_fd is not None:
+            self.root.tk.deletefilehandler(self._read_fd)
+            os.close(self._read_fd)
+            os.close(self._write_fd)
+            self._read_fd = self._write_fd = None
@@ -0,0 +1,192 @@
+import tkinter as tk
+from collections import OrderedDict
+from PIL import Image, ImageTk
+import startup_profile
+from toast_layout import TOAST_WIDTH, TOAST_HEIGHT, stack_positions, toast_height
+
+GRADIENT_CACHE_SIZE = 8
+
+_gradient_cache = OrderedDict()
+
+
+def gradient_image(width, height, color1, color2):
+    """Return a cached PhotoImage with a vertical gradient from color1 to color2"""
+    key = (width, height, color1, color2)
+    photo = _gradient_cache.get(key)
+    if photo is not None:
+        _gradient_cache.move_to_end(key)
+        return photo
+
+    # Blend the two colors through a vertical ramp mask in one pass instead of per-row math
+    mask = Image.linear_gradient('L').resize((width, height))
+    top = Image.new('RGB', (width, height), color1)
+    bottom = Image.new('RGB', (width, height), color2)
+    photo = ImageTk.PhotoImage(Image.composite(bottom, top, mask))
+
+    _gradient_cache[key] = photo
+    if len(_gradient_cache) > GRADIENT_CACHE_SIZE:
+        _gradient_cache.popitem(last=False)
+    return photo
+
+
+class ToastWindow:
+    """A notification window that is built once and reused between toasts"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        notifier = pool.notifier
+        colors = notifier.colors
+        self.visible = False
+        self._hide_job = None
+        self.animation = None
+        self._playback = None
+        self.height = TOAST_HEIGHT
+        self.colors = colors
+
+        self.window = tk.Toplevel(notifier.root)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.window.attributes('-topmost', True)
+        try:
+            self.window.attributes('-alpha', 0.98)
+        except:
+            pass
+
+        self.canvas = tk.Canvas(self.window, width=TOAST_WIDTH, height=TOAST_HEIGHT,
+                                highlightthickness=0, bd=0)
+        self.canvas.pack(fill='both', expand=True)
+
+        # Keep a reference so cache eviction can't free the image while it is shown
+        self.background = gradient_image(TOAST_WIDTH, TOAST_HEIGHT, colors['background_top'], colors['background_bottom'])
+        self.background_item = self.canvas.create_image(0, 0, image=self.background, anchor='nw')
+
+        # Notification text and buttons directly on canvas, updated in place on every show
+        self.icon_item = self.canvas.create_text(30, 35, text='☀️', font=('Segoe UI', 18), anchor='w',
+                                                 fill=colors['text_primary'])
+        self.title_item = self.canvas.create_text(60, 35, text='', font=('Segoe UI', 14, 'bold'), anchor='w',
+                                                  fill=colors['text_primary'])
+        self.message_item = self.canvas.create_text(30, 60, text='', font=('Segoe UI', 11), anchor='nw',
+                                                    fill=colors['text_secondary'])
+        self.animation_item = self.canvas.create_image(TOAST_WIDTH - 45, 45, anchor='center')
+
+        # Buttons
+        close_btn = tk.Button(self.window, text="✕", font=('Segoe UI', 11), bg=colors['background_bottom'],
+                              bd=0, command=self.hide, relief='flat')
+        self.mute_btn = tk.Button(self.window, font=('Segoe UI', 10, 'bold'),
+                                  bg=colors['button_bg'], activebackground=colors['button_hover'],
+                                  relief='flat', bd=0, padx=12, pady=4, command=notifier.toggle_mute)
+
+        self.mute_item = self.canvas.create_window(TOAST_WIDTH - 100, TOAST_HEIGHT - 40, window=self.mute_btn, anchor='nw')
+        self.close_item = self.canvas.create_window(TOAST_WIDTH - 140, TOAST_HEIGHT - 40, window=close_btn, anchor='nw')
+
+    def resize(self, height):
+        """Grow or shrink the toast in place, e.g. to fit a digest"""
+        if height == self.height:
+            return
+        self.height = height
+        self.background = gradient_image(TOAST_WIDTH, height, self.colors['background_top'],
+                                         self.colors['background_bottom'])
+        self.canvas.itemconfigure(self.background_item, image=self.background)
+        self.canvas.configure(height=height)
+        self.canvas.coords(self.mute_item, TOAST_WIDTH - 100, height - 40)
+        self.canvas.coords(self.close_item, TOAST_WIDTH - 140, height - 40)
+
+    def show(self, title, message, notification_type, duration_ms):
+        muted = self.pool.notifier.muted
+        self.canvas.itemconfigure(self.title_item, text=title)
+        self.canvas.itemconfigure(self.message_item, text=message)
+        self.resize(toast_height(message))
+        self.mute_btn.configure(text="🔊 Unmute" if muted else "🔇 Mute")
+
+        # Holding the animation keeps its frames alive even if the cache evicts them
+        notifier = self.pool.notifier
+        notifier.animation_player.stop(self._playback)
+        self.animation = notifier.animations.get(notification_type)
+        if self.animation:
+            self._playback = notifier.animation_player.play(self.canvas, self.animation_item, self.animation)
+        else:
+            self._playback = None
+            self.canvas.itemconfigure(self.animation_item, image='')
+
+        if self._hide_job is not None:
+            self.window.after_cancel(self._hide_job)
+        self._hide_job = self.window.after(duration_ms, self.hide)
+
+        self.visible = True
+        self.window.deiconify()
+        self.window.lift()
+        startup_profile.mark('first_notification')
+
+    def move(self, x, y):
+        self.window.geometry(f"{TOAST_WIDTH}x{self.height}+{x}+{y}")
+
+    def hide(self):
+        if self._hide_job is not None:
+            self.window.after_cancel(self._hide_job)
+            self._hide_job = None
+        if self.visible:
+            self.visible = False
+            self.window.withdraw()
+            self.pool.notifier.animation_player.stop(self._playback)
+            self._playback = None
+            self.canvas.itemconfigure(self.animation_item, image='')
+            self.animation = None
+            self.pool.release(self)
+
+    def destroy(self):
+        self.hide()
+        self.window.destroy()
+
+
+class ToastPool:
+    """A small pool of hidden toast windows shown with deiconify/withdraw.
+
+    Concurrent toasts are stacked up from the bottom-right corner; when every
+    window is visible the oldest one is recycled for the new notification.
+    """
+
+    def __init__(self, notifier, size=3):
+        self.notifier = notifier
+        self.size = size
+        self.windows = [ToastWindow(self)]
+        self.active = []  # visible windows, oldest first
+
+    def acquire(self):
+        for window in self.windows:
+            if not window.visible:
+                return window
+        if len(self.windows) < self.size:
+            window = ToastWindow(self)
+            self.windows.append(window)
+            return window
+        window = self.active.pop(0)
+        window.visible = False
+        return window
+
+    def show(self, title, message, notification_type, duration_ms):
+        window = self.acquire()
+        self.active.append(window)
+        window.show(title, message, notification_type, duration_ms)
+        self.layout()
+
+    def release(self, window):
+        if window in self.active:
+            self.active.remove(window)
+            self.layout()
+
+    def layout(self):
+        root = self.notifier.root
+        positions = stack_positions([window.height for window in self.active],
+                                    root.winfo_screenwidth(), root.winfo_screenheight())
+        for window, (x, y) in zip(self.active, positions):
+            window.move(x, y)
+
+    def hide_all(self):
+        for window in list(self.active):
+            window.hide()
+
+    def destroy(self):
+        for window in self.windows:
+            window.destroy()
+        self.windows = []
+        self.active = []
@@ -0,0 +1,28 @@
+TOAST_WIDTH = 400
+TOAST_HEIGHT = 150
+TOAST_SPACING = 10
+LINE_HEIGHT = 20
+SCREEN_MARGIN_X = 30
+SCREEN_MARGIN_Y = 60
+
+
+def toast_height(message):
+    """Height of a toast, grown to fit multi-line messages such as digests"""
+    return max(TOAST_HEIGHT, 110 + LINE_HEIGHT * (message.count('\n') + 1))
+
+
+def stack_positions(heights, screen_width, screen_height):
+    """Return (x, y) for toasts stacked up from the bottom-right corner.
+
+    `heights` is ordered oldest first; the newest toast sits in the corner
+    and older ones move up.
+    """
+    x = screen_width - TOAST_WIDTH - SCREEN_MARGIN_X
+    y = screen_height - SCREEN_MARGIN_Y
+    positions = []
+    for height in reversed(heights):
+        y -= height
+        positions.append((x, y))
+        y -= TOAST_SPACING
+    positions.reverse()
+    return positions
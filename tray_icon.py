@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sys
+import PIL
+from PIL import Image, ImageDraw, ImageFont
+from paths import cache_dir
+
+# Standard tray/taskbar sizes, including 125-200% scaling of the 16/32 px icons
+ICON_SIZES = (16, 20, 24, 32, 40, 48, 64, 128, 256)
+DEFAULT_SIZE = 64
+SUPERSAMPLE = 4  # drawn this many times larger, then downscaled for smooth edges at small sizes
+
+# Drawn on a 64x64 grid and scaled to each size
+DESIGN = {
+    'outline': (255, 255, 255),
+    'letter': "S",
+    'letter_size': 40,
+    'states': {
+        'normal': {'background': (73, 109, 137)},
+        'muted': {'background': (120, 120, 120), 'slash': (230, 80, 80)},
+        'paused': {'background': (73, 109, 137), 'pause': (255, 200, 60)},
+    }
+}
+STATES = tuple(DESIGN['states'])
+
+
+def design_key():
+    """Hash of everything that affects the rendered bitmaps"""
+    params = json.dumps({'design': DESIGN, 'sizes': ICON_SIZES, 'pillow': PIL.__version__}, sort_keys=True)
+    return hashlib.sha1(params.encode()).hexdigest()[:16]
+
+
+def _font(size):
+    # Pillow's bundled font, so there is no system font lookup (arial.ttf doesn't exist on Linux)
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def render(state, size):
+    """Draw the icon for `state` at `size` x `size` pixels"""
+    style = DESIGN['states'][state]
+    scale = size * SUPERSAMPLE / 64.0
+    canvas = int(size * SUPERSAMPLE)
+    img = Image.new('RGB', (canvas, canvas), color=style['background'])
+    draw = ImageDraw.Draw(img)
+    draw.ellipse([4 * scale, 4 * scale, 60 * scale, 60 * scale], fill=style['background'],
+                 outline=DESIGN['outline'], width=max(1, int(2 * scale)))
+
+    font = _font(int(DESIGN['letter_size'] * scale))
+    if isinstance(font, ImageFont.FreeTypeFont):
+        draw.text((32 * scale, 32 * scale), DESIGN['letter'], fill=DESIGN['outline'], font=font, anchor='mm')
+    else:
+        draw.text((22 * scale, 12 * scale), DESIGN['letter'], fill=DESIGN['outline'], font=font)
+
+    if 'slash' in style:
+        draw.line([14 * scale, 50 * scale, 50 * scale, 14 * scale], fill=style['slash'], width=int(6 * scale))
+    if 'pause' in style:
+        # Two bars in a badge at the bottom-right corner
+        draw.ellipse([36 * scale, 36 * scale, 62 * scale, 62 * scale], fill=style['pause'])
+        for x in (44, 52):
+            draw.rectangle([(x - 2) * scale, 42 * scale, (x + 1) * scale, 56 * scale], fill=style['background'])
+
+    return img.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def _cache_path(state, size):
+    return os.path.join(cache_dir('tray', design_key()), f'{state}_{size}.png')
+
+
+def render_all():
+    """Render every state at every size into the disk cache"""
+    for state in STATES:
+        for size in ICON_SIZES:
+            try:
+                path = _cache_path(state, size)
+                tmp_path = path + '.tmp'
+                render(state, size).save(tmp_path, format='PNG')
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Could not write tray icon cache for {state} at {size}px: {str(e)}")
+
+
+def tray_icon_size():
+    """Pixel size the system tray shows icons at"""
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            # SM_CXSMICON, in physical pixels once the process is DPI aware
+            size = ctypes.windll.user32.GetSystemMetrics(49)
+            if size > 0:
+                return size
+        except Exception:
+            pass
+    return DEFAULT_SIZE
+
+
+class TrayIcons:
+    """Tray icon bitmaps for each state, loaded once from the disk cache.
+
+    The first run renders every state and size into the cache; later starts
+    only read the PNGs for the size in use, so switching state is a dict lookup.
+    """
+
+    def __init__(self, size=None):
+        wanted = size or tray_icon_size()
+        # Smallest cached size that is at least as large as the tray's, so it is only ever scaled down
+        self.size = min((s for s in ICON_SIZES if s >= wanted), default=ICON_SIZES[-1])
+        self._images = {}
+
+    def get(self, state='normal'):
+        image = self._images.get(state)
+        if image is None:
+            try:
+                path = _cache_path(state, self.size)
+                if not os.path.exists(path):
+                    render_all()
+                with Image.open(path) as cached:
+                    image = cached.convert('RGB')
+            except OSError:
+                # No usable cache folder or file: draw this one in memory
+                image = render(state, self.size)
+            self._images[state] = image
+        return image
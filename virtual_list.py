@@ -0,0 +1,89 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualList:
+    """A scrolling list on a canvas that only has items for the rows in view.
+
+    A fixed pool of text items is relabelled as the view scrolls, so a list
+    of thousands of entries costs the same to show as a screenful. Rows are
+    identified by key (e.g. a reminder id), never by position, so filtering
+    doesn't change what is selected.
+    """
+
+    def __init__(self, parent, format_row, rows=8, row_height=22):
+        self.format_row = format_row  # key -> row text
+        self.rows = rows
+        self.row_height = row_height
+        self.keys = []
+        self.first = 0
+        self.selected = None
+
+        self.frame = ttk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, height=rows * row_height, bg='white', highlightthickness=1,
+                                highlightbackground='#a0a0a0')
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._highlight = self.canvas.create_rectangle(0, 0, 0, 0, fill='#cce4ff', outline='', state='hidden')
+        self._items = [self.canvas.create_text(6, i * row_height + row_height // 2, anchor='w', text='')
+                       for i in range(rows)]
+
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.canvas.bind('<Button-4>', lambda e: self.scroll(-1))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll(1))
+        self.canvas.bind('<Configure>', lambda e: self._redraw())
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_keys(self, keys):
+        """Show these rows, keeping the scroll position where possible"""
+        self.keys = keys
+        if self.selected is not None and self.selected not in set(keys):
+            # A row hidden by a filter must not stay the target of actions
+            self.selected = None
+        self.first = max(0, min(self.first, len(keys) - self.rows))
+        self._redraw()
+
+    def selection(self):
+        return self.selected
+
+    def scroll(self, rows):
+        self.first = max(0, min(self.first + rows, len(self.keys) - self.rows))
+        self._redraw()
+
+    def yview(self, *args):
+        # Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"/"pages")
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.keys))
+            self.scroll(0)
+        elif args[0] == 'scroll':
+            step = self.rows if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def _on_click(self, event):
+        index = self.first + int(self.canvas.canvasy(event.y)) // self.row_height
+        if index < len(self.keys):
+            self.selected = self.keys[index]
+            self._redraw()
+
+    def _redraw(self):
+        visible = self.keys[self.first:self.first + self.rows]
+        for row, item in enumerate(self._items):
+            self.canvas.itemconfigure(item, text=self.format_row(visible[row]) if row < len(visible) else '')
+
+        if self.selected in visible:
+            row = visible.index(self.selected)
+            self.canvas.coords(self._highlight, 0, row * self.row_height,
+                               self.canvas.winfo_width(), (row + 1) * self.row_height)
+            self.canvas.itemconfigure(self._highlight, state='normal')
+        else:
+            self.canvas.itemconfigure(self._highlight, state='hidden')
+
+        if self.keys:
+            self.scrollbar.set(self.first / len(self.keys), min(1.0, (self.first + self.rows) / len(self.keys)))
+        else:
+            self.scrollbar.set(0, 1)